@@ -7,6 +7,7 @@ import type {
   Hint,
   SessionStatus,
 } from '@/types';
+import { decodeBinaryFrame } from '@/lib/frames';
 
 interface UseWebSocketOptions {
   onTranscriptDelta?: (segment: TranscriptSegment) => void;
@@ -41,7 +42,12 @@ export function useWebSocket(options: UseWebSocketOptions = {}): UseWebSocketRet
 
   const handleMessage = useCallback((event: MessageEvent) => {
     try {
-      const data: ServerMessage = JSON.parse(event.data);
+      const data: ServerMessage | null = typeof event.data === 'string'
+        ? JSON.parse(event.data)
+        : decodeBinaryFrame(event.data);
+      if (!data) {
+        return;
+      }
 
       switch (data.type) {
         case 'transcript_delta':
@@ -109,6 +115,7 @@ export function useWebSocket(options: UseWebSocketOptions = {}): UseWebSocketRet
     const wsUrl = `${protocol}//${window.location.host}/ws`;
 
     const ws = new WebSocket(wsUrl);
+    ws.binaryType = 'arraybuffer';
     wsRef.current = ws;
 
     ws.onopen = () => {
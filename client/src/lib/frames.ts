@@ -0,0 +1,46 @@
+import type { ServerMessage, Speaker } from '@/types';
+
+// Binary frame tags for high-rate server -> client events (see server/app/routes/websocket.py)
+const FRAME_HINT_TOKEN = 0x01;
+const FRAME_TRANSCRIPT_DELTA = 0x02;
+
+// Speaker bytes match the audio channel IDs (0=mic, 1=system)
+const SPEAKERS: Speaker[] = ['ME', 'THEM'];
+
+const decoder = new TextDecoder();
+
+/**
+ * Decode a binary server frame into the equivalent JSON message shape.
+ * Returns null for unknown frame tags.
+ */
+export function decodeBinaryFrame(buffer: ArrayBuffer): ServerMessage | null {
+  const view = new DataView(buffer);
+  const bytes = new Uint8Array(buffer);
+
+  switch (view.getUint8(0)) {
+    case FRAME_HINT_TOKEN: {
+      // tag (u8), hint_id length (u8), hint_id, token
+      const idEnd = 2 + view.getUint8(1);
+      return {
+        type: 'hint_token',
+        hint_id: decoder.decode(bytes.subarray(2, idEnd)),
+        token: decoder.decode(bytes.subarray(idEnd)),
+      };
+    }
+
+    case FRAME_TRANSCRIPT_DELTA: {
+      // tag (u8), speaker (u8), timestamp (f64 LE), segment_id length (u8), segment_id, text
+      const idEnd = 11 + view.getUint8(10);
+      return {
+        type: 'transcript_delta',
+        speaker: SPEAKERS[view.getUint8(1)],
+        timestamp: view.getFloat64(2, true),
+        segment_id: decoder.decode(bytes.subarray(11, idEnd)),
+        text: decoder.decode(bytes.subarray(idEnd)),
+      };
+    }
+
+    default:
+      return null;
+  }
+}
@@ -15,4 +15,4 @@ echo "=== Build Complete ==="
 echo "Client built to server/static/"
 echo
 echo "To run production server:"
-echo "  cd server && source venv/bin/activate && uvicorn app.main:app --host 0.0.0.0 --port 8010"
+echo "  cd server && source venv/bin/activate && uvicorn app.main:app --loop uvloop --host 0.0.0.0 --port 8010"
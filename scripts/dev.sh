@@ -28,7 +28,7 @@ trap cleanup SIGINT SIGTERM
 echo "Starting Python server..."
 cd server
 source venv/bin/activate
-uvicorn app.main:app --reload --host 0.0.0.0 --port 8010 &
+uvicorn app.main:app --reload --loop uvloop --host 0.0.0.0 --port 8010 &
 SERVER_PID=$!
 cd ..
 
@@ -2,8 +2,7 @@
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import Literal
-from functools import lru_cache
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -51,6 +50,9 @@ BYTES_PER_SAMPLE = 2        # 16-bit PCM
 
 # Queue settings
 AUDIO_QUEUE_MAX_SIZE = 200  # Max frames in queue (~4 seconds at 20ms/frame)
+STT_BATCH_MAX_FRAMES = 3    # Max already-queued frames merged into one STT append (60ms)
+OUT_QUEUE_MAX_SIZE = 500    # Max outbound events waiting on a slow client
+OUT_QUEUE_STREAM_LIMIT = 400  # Hint tokens / transcript deltas dropped beyond this depth
 
 # Orchestrator settings
 AGGREGATION_TIMEOUT_MS = 800    # Trigger after this many ms without completed
@@ -59,10 +61,28 @@ HINT_RATE_LIMIT_MS = 2000       # Min time between hints for Meeting Assistant
 
 # LLM settings
 MAX_HINT_POINTS = 3             # Maximum bullet points in hint
+HINT_TOKEN_COALESCE_MS = 10     # Merge hint tokens queued within this window into one frame
 MAX_CONTEXT_TOKENS = 2000       # Max tokens for knowledge context
 
+# Shared HTTP client (Ollama)
+HTTP_TIMEOUT_S = 30.0           # Overall request timeout
+HTTP_CONNECT_TIMEOUT_S = 5.0    # Fail fast if Ollama is unreachable
+HTTP_MAX_CONNECTIONS = 64       # Upper bound on concurrent connections
+HTTP_MAX_KEEPALIVE = 32         # Idle connections kept in the pool
+HTTP_KEEPALIVE_EXPIRY_S = 60.0  # Keep idle connections across gaps between hints
+
+# Shared aiohttp session (OpenAI Realtime STT WebSockets)
+STT_MAX_CONNECTIONS = 8         # Two sockets per session, room for reconnects
+STT_DNS_CACHE_TTL_S = 300       # Reuse the resolved API host across sessions
+STT_WS_HEARTBEAT_S = 20.0       # Ping interval to detect dead STT sockets
+
+
+_settings: Optional[Settings] = None
+
 
-@lru_cache
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get the process-wide settings instance, loading it on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
@@ -3,12 +3,23 @@
 import logging
 from contextlib import asynccontextmanager
 
+import aiohttp
+import httpx
 import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from app.config import get_settings
+from app.config import (
+    get_settings,
+    HTTP_CONNECT_TIMEOUT_S,
+    HTTP_KEEPALIVE_EXPIRY_S,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HTTP_TIMEOUT_S,
+    STT_DNS_CACHE_TTL_S,
+    STT_MAX_CONNECTIONS,
+)
 from app.routes import websocket, api
 from app.services.session_manager import SessionManager
 
@@ -58,6 +69,29 @@ async def lifespan(app: FastAPI):
     session_manager = SessionManager()
     app.state.session_manager = session_manager
 
+    # Shared HTTP client (connection pool reused across sessions). Idle
+    # connections outlive the default 5 s expiry so hints spaced further
+    # apart still reuse a warm connection.
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_TIMEOUT_S, connect=HTTP_CONNECT_TIMEOUT_S),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_S,
+        ),
+    )
+    app.state.http_client = http_client
+
+    # Shared aiohttp session for the STT WebSockets (DNS cache and TLS
+    # context reused across clients and sessions)
+    stt_http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=STT_MAX_CONNECTIONS,
+            ttl_dns_cache=STT_DNS_CACHE_TTL_S,
+        ),
+    )
+    app.state.stt_http_session = stt_http_session
+
     log.info("Server started successfully")
 
     yield
@@ -66,6 +100,8 @@ async def lifespan(app: FastAPI):
     log.info("Shutting down server")
     if session_manager:
         await session_manager.shutdown()
+    await http_client.aclose()
+    await stt_http_session.close()
     log.info("Server shutdown complete")
 
 
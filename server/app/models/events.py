@@ -1,12 +1,16 @@
 """Event models for WebSocket communication."""
 
 from enum import Enum
-from typing import Literal, Optional, Union
+from typing import Annotated, Literal, Optional, Union
 from pydantic import BaseModel, Field
 
 
 class Speaker(str, Enum):
-    """Speaker identifier."""
+    """Speaker identifier.
+
+    Values are the wire format; validated models hold the members
+    themselves, so server code compares speakers with `is`.
+    """
     ME = "ME"
     THEM = "THEM"
 
@@ -112,14 +116,17 @@ class SetKnowledgeMessage(BaseModel):
 
 
 # Union types for parsing
-ClientMessage = Union[
-    StartSessionMessage,
-    StopSessionMessage,
-    PauseHintsMessage,
-    ResumeHintsMessage,
-    SetModeMessage,
-    SetPromptMessage,
-    SetKnowledgeMessage,
+ClientMessage = Annotated[
+    Union[
+        StartSessionMessage,
+        StopSessionMessage,
+        PauseHintsMessage,
+        ResumeHintsMessage,
+        SetModeMessage,
+        SetPromptMessage,
+        SetKnowledgeMessage,
+    ],
+    Field(discriminator="type"),
 ]
 
 ServerMessage = Union[
@@ -1,12 +1,21 @@
 """Session model for managing active sessions."""
 
 import asyncio
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import Enum
 from typing import Optional
+import time
 import uuid
 
+import structlog
+
+from app.config import AUDIO_QUEUE_MAX_SIZE, OUT_QUEUE_MAX_SIZE, OUT_QUEUE_STREAM_LIMIT
+from app.models.events import HintToken, TranscriptDelta
+from app.utils.audio import StreamingResampler
+
+logger = structlog.get_logger()
+
 
 class SessionState(str, Enum):
     """Session state."""
@@ -22,38 +31,47 @@ class SessionMode(str, Enum):
     MEETING_ASSISTANT = "meeting_assistant"
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionStats:
     """Session statistics."""
     dropped_frames_mic: int = 0
     dropped_frames_system: int = 0
+    dropped_frames_total: int = 0
     total_frames_mic: int = 0
     total_frames_system: int = 0
     transcript_segments: int = 0
     hints_generated: int = 0
     stt_errors: int = 0
     llm_errors: int = 0
-
-    @property
-    def dropped_frames_count(self) -> int:
-        """Total dropped frames."""
-        return self.dropped_frames_mic + self.dropped_frames_system
+    dropped_events: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """Active session state."""
     session_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: float = field(default_factory=time.time)
     state: SessionState = SessionState.CREATED
     mode: SessionMode = SessionMode.INTERVIEW_ASSISTANT
     hints_enabled: bool = True
     custom_prompt: Optional[str] = None
     knowledge_workspace: Optional[str] = None
 
-    # Audio queues
-    mic_queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=200))
-    system_queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=200))
+    # Audio queues of int16 sample arrays (bounded; appending to a full
+    # queue drops the oldest frame)
+    mic_queue: deque = field(default_factory=lambda: deque(maxlen=AUDIO_QUEUE_MAX_SIZE))
+    system_queue: deque = field(default_factory=lambda: deque(maxlen=AUDIO_QUEUE_MAX_SIZE))
+    mic_ready: asyncio.Event = field(default_factory=asyncio.Event)
+    system_ready: asyncio.Event = field(default_factory=asyncio.Event)
+
+    # Per-channel resampler state (filter history carries across frames)
+    mic_resampler: StreamingResampler = field(default_factory=StreamingResampler)
+    system_resampler: StreamingResampler = field(default_factory=StreamingResampler)
+
+    # Outbound events for the client connection (bounded; fill via send_event)
+    out_queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=OUT_QUEUE_MAX_SIZE)
+    )
 
     # Statistics
     stats: SessionStats = field(default_factory=SessionStats)
@@ -61,6 +79,28 @@ class Session:
     # Internal state
     _tasks: list = field(default_factory=list)
 
+    def send_event(self, event) -> None:
+        """
+        Queue an outbound event without waiting on the client.
+
+        When the client falls behind, hint tokens and transcript deltas are
+        dropped first; the completed events that follow carry the full text.
+        The headroom above OUT_QUEUE_STREAM_LIMIT is kept for those and for
+        status messages, which are only dropped once the queue is full.
+        """
+        queue = self.out_queue
+        if isinstance(event, (HintToken, TranscriptDelta)) and queue.qsize() >= OUT_QUEUE_STREAM_LIMIT:
+            self.stats.dropped_events += 1
+            return
+
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.stats.dropped_events += 1
+            logger.warning("Outbound queue full, dropping event",
+                           session_id=self.session_id,
+                           event_type=type(event).__name__)
+
     def add_task(self, task: asyncio.Task) -> None:
         """Register a background task."""
         self._tasks.append(task)
@@ -85,7 +125,8 @@ class Session:
             "hints_enabled": self.hints_enabled,
             "knowledge_workspace": self.knowledge_workspace,
             "stats": {
-                "dropped_frames": self.stats.dropped_frames_count,
+                "dropped_frames": self.stats.dropped_frames_total,
+                "dropped_events": self.stats.dropped_events,
                 "transcript_segments": self.stats.transcript_segments,
                 "hints_generated": self.stats.hints_generated,
             }
@@ -1,5 +1,6 @@
 """REST API routes for knowledge management and session info."""
 
+import asyncio
 import os
 from pathlib import Path
 from typing import List
@@ -9,11 +10,15 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Request
 from pydantic import BaseModel
 
 from app.config import get_settings
+from app.services.knowledge_service import get_knowledge_service
 
 router = APIRouter(tags=["api"])
 
-# Workspaces directory
-WORKSPACES_DIR = Path("./workspaces")
+# Workspaces directory (resolved once at import)
+WORKSPACES_DIR = Path("./workspaces").resolve()
+
+# Upload copy buffer size
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 
 class WorkspaceInfo(BaseModel):
@@ -37,12 +42,63 @@ class WorkspaceStats(BaseModel):
     files: List[FileInfo]
 
 
+def _workspace_path(name: str) -> Path:
+    """Resolve a workspace directory, rejecting names that escape WORKSPACES_DIR."""
+    workspace_path = (WORKSPACES_DIR / name).resolve()
+    if workspace_path.parent != WORKSPACES_DIR:
+        raise HTTPException(status_code=400, detail="Invalid workspace name")
+    return workspace_path
+
+
+def _workspace_file(workspace_path: Path, filename: str) -> Path:
+    """Resolve a file inside a workspace, rejecting names that escape it."""
+    file_path = (workspace_path / filename).resolve()
+    if file_path.parent != workspace_path:
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    return file_path
+
+
+# Cached .md listings per workspace: path -> (directory mtime, files)
+_SCAN_CACHE: dict[Path, tuple[int, List[FileInfo]]] = {}
+
+
+def _scan_workspace(workspace_path: Path) -> List[FileInfo]:
+    """List .md files in a workspace, rescanning only when the directory changes."""
+    mtime = workspace_path.stat().st_mtime_ns
+    cached = _SCAN_CACHE.get(workspace_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with os.scandir(workspace_path) as entries:
+        files = [
+            FileInfo(filename=entry.name, size=entry.stat().st_size)
+            for entry in entries
+            if entry.name.endswith(".md") and entry.is_file()
+        ]
+    _SCAN_CACHE[workspace_path] = (mtime, files)
+    return files
+
+
+def _list_workspaces() -> List[WorkspaceInfo]:
+    """Build workspace summaries from cached scans."""
+    workspaces = []
+    for workspace_path in WORKSPACES_DIR.iterdir():
+        if workspace_path.is_dir():
+            files = _scan_workspace(workspace_path)
+            workspaces.append(WorkspaceInfo(
+                name=workspace_path.name,
+                file_count=len(files),
+                total_size=sum(f.size for f in files)
+            ))
+    return workspaces
+
+
 # Workspace endpoints
 
 @router.post("/workspaces", response_model=WorkspaceInfo)
 async def create_workspace(name: str):
     """Create a new workspace."""
-    workspace_path = WORKSPACES_DIR / name
+    workspace_path = _workspace_path(name)
 
     if workspace_path.exists():
         raise HTTPException(status_code=400, detail="Workspace already exists")
@@ -59,40 +115,23 @@ async def list_workspaces():
         WORKSPACES_DIR.mkdir(parents=True, exist_ok=True)
         return []
 
-    workspaces = []
-    for workspace_path in WORKSPACES_DIR.iterdir():
-        if workspace_path.is_dir():
-            files = list(workspace_path.glob("*.md"))
-            total_size = sum(f.stat().st_size for f in files)
-            workspaces.append(WorkspaceInfo(
-                name=workspace_path.name,
-                file_count=len(files),
-                total_size=total_size
-            ))
-
-    return workspaces
+    return await asyncio.to_thread(_list_workspaces)
 
 
 @router.get("/workspaces/{name}/stats", response_model=WorkspaceStats)
 async def get_workspace_stats(name: str):
     """Get workspace statistics."""
-    workspace_path = WORKSPACES_DIR / name
+    workspace_path = _workspace_path(name)
 
-    if not workspace_path.exists():
+    try:
+        files = await asyncio.to_thread(_scan_workspace, workspace_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Workspace not found")
 
-    files = []
-    total_size = 0
-
-    for file_path in workspace_path.glob("*.md"):
-        size = file_path.stat().st_size
-        total_size += size
-        files.append(FileInfo(filename=file_path.name, size=size))
-
     return WorkspaceStats(
         name=name,
         file_count=len(files),
-        total_size=total_size,
+        total_size=sum(f.size for f in files),
         files=files
     )
 
@@ -100,51 +139,52 @@ async def get_workspace_stats(name: str):
 @router.post("/workspaces/{name}/files")
 async def upload_file(name: str, file: UploadFile = File(...)):
     """Upload a file to workspace."""
-    workspace_path = WORKSPACES_DIR / name
-
-    if not workspace_path.exists():
-        workspace_path.mkdir(parents=True, exist_ok=True)
+    workspace_path = _workspace_path(name)
 
     # Only allow .md files
     if not file.filename.endswith(".md"):
         raise HTTPException(status_code=400, detail="Only .md files are allowed")
 
-    file_path = workspace_path / file.filename
+    file_path = _workspace_file(workspace_path, file.filename)
+    workspace_path.mkdir(parents=True, exist_ok=True)
 
+    size = 0
     async with aiofiles.open(file_path, "wb") as f:
-        content = await file.read()
-        await f.write(content)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
+            size += len(chunk)
 
-    return {"filename": file.filename, "size": len(content)}
+    # Overwriting an existing file does not change the directory mtime
+    _SCAN_CACHE.pop(workspace_path, None)
+    await asyncio.to_thread(get_knowledge_service().invalidate, name)
+
+    return {"filename": file.filename, "size": size}
 
 
 @router.get("/workspaces/{name}/files", response_model=List[FileInfo])
 async def list_files(name: str):
     """List files in workspace."""
-    workspace_path = WORKSPACES_DIR / name
+    workspace_path = _workspace_path(name)
 
-    if not workspace_path.exists():
+    try:
+        return await asyncio.to_thread(_scan_workspace, workspace_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Workspace not found")
 
-    files = []
-    for file_path in workspace_path.glob("*.md"):
-        files.append(FileInfo(
-            filename=file_path.name,
-            size=file_path.stat().st_size
-        ))
-
-    return files
-
 
 @router.delete("/workspaces/{name}/files/{filename}")
 async def delete_file(name: str, filename: str):
     """Delete a file from workspace."""
-    file_path = WORKSPACES_DIR / name / filename
+    workspace_path = _workspace_path(name)
+    file_path = _workspace_file(workspace_path, filename)
 
-    if not file_path.exists():
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
 
-    os.remove(file_path)
+    _SCAN_CACHE.pop(workspace_path, None)
+    await asyncio.to_thread(get_knowledge_service().invalidate, name)
 
     return {"deleted": filename}
 
@@ -1,29 +1,90 @@
 """WebSocket endpoint for real-time audio and events."""
 
 import asyncio
-import json
-from typing import Optional
+import struct
+from typing import Any, Optional
 
+import numpy as np
 import structlog
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import TypeAdapter, ValidationError
 
-from app.config import AUDIO_QUEUE_MAX_SIZE
+from app.config import AUDIO_QUEUE_MAX_SIZE, HINT_TOKEN_COALESCE_MS
 from app.models.session import Session, SessionState, SessionMode
 from app.models.events import (
+    Speaker,
     SessionStatus,
     TranscriptDelta,
-    TranscriptCompleted,
     HintToken,
-    HintCompleted,
     ErrorMessage,
+    ClientMessage,
+    StartSessionMessage,
+    StopSessionMessage,
+    PauseHintsMessage,
+    ResumeHintsMessage,
+    SetModeMessage,
+    SetPromptMessage,
+    SetKnowledgeMessage,
 )
 from app.services.session_manager import SessionManager
-from app.utils.event_bus import EventType
+from app.services.stt_service import STTService
+from app.services.orchestrator import Orchestrator
+from app.services.llm_service import LLMService
 
 logger = structlog.get_logger()
 
 router = APIRouter()
 
+# Binary frame tags for high-rate server -> client events.
+# Control and low-rate messages stay JSON text frames.
+FRAME_HINT_TOKEN = 0x01
+FRAME_TRANSCRIPT_DELTA = 0x02
+
+# Speaker bytes match the client audio channel IDs (0=mic, 1=system)
+SPEAKER_BYTES = {Speaker.ME: 0, Speaker.THEM: 1}
+
+_CLIENT_MESSAGE_ADAPTER = TypeAdapter(ClientMessage)
+
+# IDs are length-prefixed with a u8; longer ones are sent as JSON instead
+MAX_FRAME_ID_BYTES = 255
+
+_HINT_TOKEN_HEADER = struct.Struct("<BB")
+_TRANSCRIPT_DELTA_HEADER = struct.Struct("<BBdB")
+
+
+def encode_hint_token(event: HintToken) -> bytes | str:
+    """
+    Encode a hint token as a binary frame.
+
+    Layout: tag (u8), hint_id length (u8), hint_id, token (UTF-8, rest of frame).
+    Falls back to the JSON text frame if hint_id exceeds MAX_FRAME_ID_BYTES.
+    """
+    hint_id = event.hint_id.encode()
+    if len(hint_id) > MAX_FRAME_ID_BYTES:
+        return event.model_dump_json()
+    header = _HINT_TOKEN_HEADER.pack(FRAME_HINT_TOKEN, len(hint_id))
+    return header + hint_id + event.token.encode()
+
+
+def encode_transcript_delta(event: TranscriptDelta) -> bytes | str:
+    """
+    Encode a transcript delta as a binary frame.
+
+    Layout: tag (u8), speaker (u8), timestamp (f64 LE), segment_id length (u8),
+    segment_id, text (UTF-8, rest of frame).
+    Falls back to the JSON text frame if segment_id exceeds MAX_FRAME_ID_BYTES.
+    """
+    segment_id = event.segment_id.encode()
+    if len(segment_id) > MAX_FRAME_ID_BYTES:
+        return event.model_dump_json()
+    header = _TRANSCRIPT_DELTA_HEADER.pack(
+        FRAME_TRANSCRIPT_DELTA,
+        SPEAKER_BYTES[event.speaker],
+        event.timestamp,
+        len(segment_id),
+    )
+    return header + segment_id + event.text.encode()
+
 
 class ConnectionHandler:
     """Handles a single WebSocket connection."""
@@ -33,7 +94,8 @@ class ConnectionHandler:
         self.session_manager = session_manager
         self.session: Optional[Session] = None
         self.event_bus = session_manager.event_bus
-        self._send_lock = asyncio.Lock()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._last_status: Optional[str] = None
 
     async def handle(self) -> None:
         """Main handler for the WebSocket connection."""
@@ -44,11 +106,12 @@ class ConnectionHandler:
             # Create session
             self.session = await self.session_manager.create_session()
 
-            # Subscribe to events
-            await self._subscribe_events()
+            # Start forwarding session events to the client
+            self._writer_task = asyncio.create_task(self._writer())
+            self._writer_task.add_done_callback(self._on_writer_done)
 
             # Send initial status
-            await self._send_status()
+            self._send_status()
 
             # Handle messages
             await self._message_loop()
@@ -57,6 +120,7 @@ class ConnectionHandler:
             logger.info("WebSocket disconnected")
         except Exception as e:
             logger.error("WebSocket error", error=str(e))
+            await self._stop_writer()
             await self._send_error(str(e))
         finally:
             await self._cleanup()
@@ -79,68 +143,60 @@ class ConnectionHandler:
         if not self.session or self.session.state != SessionState.ACTIVE:
             return
 
-        if len(data) < 2:
+        # Channel ID byte plus a whole number of int16 samples
+        if len(data) < 3 or len(data) % 2 == 0:
             return
 
-        # First byte is channel ID
+        # First byte is channel ID; view the PCM payload as int16 without copying
         channel_id = data[0]
-        pcm_data = data[1:]
+        pcm_data = np.frombuffer(data, dtype=np.int16, offset=1)
 
         # Route to appropriate queue
         if channel_id == 0:  # Mic
             queue = self.session.mic_queue
+            ready = self.session.mic_ready
             self.session.stats.total_frames_mic += 1
+            if len(queue) == AUDIO_QUEUE_MAX_SIZE:
+                self.session.stats.dropped_frames_mic += 1
+                self.session.stats.dropped_frames_total += 1
         elif channel_id == 1:  # System
             queue = self.session.system_queue
+            ready = self.session.system_ready
             self.session.stats.total_frames_system += 1
+            if len(queue) == AUDIO_QUEUE_MAX_SIZE:
+                self.session.stats.dropped_frames_system += 1
+                self.session.stats.dropped_frames_total += 1
         else:
             return
 
-        # Try to add to queue, drop oldest if full
-        try:
-            queue.put_nowait(pcm_data)
-        except asyncio.QueueFull:
-            # Drop oldest frame
-            try:
-                queue.get_nowait()
-            except asyncio.QueueEmpty:
-                pass
-            try:
-                queue.put_nowait(pcm_data)
-            except asyncio.QueueFull:
-                pass
-
-            if channel_id == 0:
-                self.session.stats.dropped_frames_mic += 1
-            else:
-                self.session.stats.dropped_frames_system += 1
+        # Bounded deque drops the oldest frame when full
+        queue.append(pcm_data)
+        ready.set()
 
     async def _handle_control(self, text: str) -> None:
         """Handle control message."""
         try:
-            data = json.loads(text)
-            msg_type = data.get("type")
+            message = _CLIENT_MESSAGE_ADAPTER.validate_json(text)
+        except ValidationError as e:
+            logger.error("Invalid control message", error=str(e))
+            await self._send_error("Invalid message")
+            return
 
-            if msg_type == "start_session":
+        match message:
+            case StartSessionMessage():
                 await self._start_session()
-            elif msg_type == "stop_session":
+            case StopSessionMessage():
                 await self._stop_session()
-            elif msg_type == "pause_hints":
+            case PauseHintsMessage():
                 self._set_hints_enabled(False)
-            elif msg_type == "resume_hints":
+            case ResumeHintsMessage():
                 self._set_hints_enabled(True)
-            elif msg_type == "set_mode":
-                self._set_mode(data.get("mode", "interview_assistant"))
-            elif msg_type == "set_prompt":
-                self._set_prompt(data.get("prompt", ""))
-            elif msg_type == "set_knowledge":
-                self._set_knowledge(data.get("workspace", ""))
-            else:
-                logger.warning("Unknown message type", msg_type=msg_type)
-
-        except json.JSONDecodeError as e:
-            logger.error("Invalid JSON message", error=str(e))
-            await self._send_error("Invalid JSON")
+            case SetModeMessage(mode=mode):
+                self._set_mode(mode)
+            case SetPromptMessage(prompt=prompt):
+                self._set_prompt(prompt)
+            case SetKnowledgeMessage(workspace=workspace):
+                self._set_knowledge(workspace)
 
     async def _start_session(self) -> None:
         """Start the session and processing pipeline."""
@@ -149,13 +205,12 @@ class ConnectionHandler:
 
         await self.session_manager.start_session(self.session)
 
-        # Import here to avoid circular imports
-        from app.services.stt_service import STTService
-        from app.services.orchestrator import Orchestrator
-        from app.services.llm_service import LLMService
-
         # Start STT service
-        stt_service = STTService(self.session, self.event_bus)
+        stt_service = STTService(
+            self.session,
+            self.event_bus,
+            self.websocket.app.state.stt_http_session,
+        )
         task = asyncio.create_task(stt_service.run())
         self.session.add_task(task)
 
@@ -165,11 +220,15 @@ class ConnectionHandler:
         self.session.add_task(task)
 
         # Start LLM service
-        llm_service = LLMService(self.session, self.event_bus)
+        llm_service = LLMService(
+            self.session,
+            self.event_bus,
+            self.websocket.app.state.http_client,
+        )
         task = asyncio.create_task(llm_service.run())
         self.session.add_task(task)
 
-        await self._send_status()
+        self._send_status()
         logger.info("Session pipeline started", session_id=self.session.session_id)
 
     async def _stop_session(self) -> None:
@@ -178,13 +237,13 @@ class ConnectionHandler:
             return
 
         await self.session_manager.stop_session(self.session)
-        await self._send_status()
+        self._send_status()
 
     def _set_hints_enabled(self, enabled: bool) -> None:
         """Set hints enabled state."""
         if self.session:
             self.session_manager.set_hints_enabled(self.session, enabled)
-            asyncio.create_task(self._send_status())
+            self._send_status()
 
     def _set_mode(self, mode: str) -> None:
         """Set session mode."""
@@ -192,7 +251,7 @@ class ConnectionHandler:
             try:
                 session_mode = SessionMode(mode)
                 self.session_manager.set_mode(self.session, session_mode)
-                asyncio.create_task(self._send_status())
+                self._send_status()
             except ValueError:
                 logger.warning("Invalid mode", mode=mode)
 
@@ -206,64 +265,160 @@ class ConnectionHandler:
         if self.session:
             self.session_manager.set_knowledge_workspace(self.session, workspace)
 
-    async def _subscribe_events(self) -> None:
-        """Subscribe to event bus events."""
-        await self.event_bus.subscribe(EventType.TRANSCRIPT_DELTA, self._on_transcript_delta)
-        await self.event_bus.subscribe(EventType.TRANSCRIPT_COMPLETED, self._on_transcript_completed)
-        await self.event_bus.subscribe(EventType.HINT_TOKEN, self._on_hint_token)
-        await self.event_bus.subscribe(EventType.HINT_COMPLETED, self._on_hint_completed)
+    async def _writer(self) -> None:
+        """Drain the session's outbound queue to the WebSocket.
 
-    async def _on_transcript_delta(self, event: TranscriptDelta) -> None:
-        """Handle transcript delta event."""
-        await self._send_json(event.model_dump())
+        This task is the only sender while it runs, so sends need no lock.
+        An event that fails to encode is logged and skipped; a failed send
+        closes the socket, which ends the message loop and the session.
+        """
+        queue = self.session.out_queue
+        pending = None
+        while True:
+            if pending is not None:
+                event, pending = pending, None
+            else:
+                event = await queue.get()
+
+            try:
+                if isinstance(event, HintToken):
+                    event, pending = await self._coalesce_hint_tokens(event)
+                payload = self._encode(event)
+            except Exception as e:
+                logger.error("Failed to encode event",
+                             event_type=type(event).__name__,
+                             error=str(e))
+                continue
 
-    async def _on_transcript_completed(self, event: TranscriptCompleted) -> None:
-        """Handle transcript completed event."""
-        await self._send_json(event.model_dump())
+            try:
+                if isinstance(payload, bytes):
+                    await self.websocket.send_bytes(payload)
+                else:
+                    await self.websocket.send_text(payload)
+            except Exception as e:
+                logger.error("Failed to send message", error=str(e))
+                await self._close()
+                return
+
+    @staticmethod
+    def _encode(event: Any) -> str | bytes:
+        """Encode an outbound event as a text or binary frame payload.
+
+        Queued strings are pre-serialized JSON text frames.
+        """
+        if isinstance(event, str):
+            return event
+        if isinstance(event, HintToken):
+            return encode_hint_token(event)
+        if isinstance(event, TranscriptDelta):
+            return encode_transcript_delta(event)
+        return event.model_dump_json()
+
+    def _on_writer_done(self, task: asyncio.Task) -> None:
+        """Log the writer stopping other than by cancellation on cleanup."""
+        if task.cancelled():
+            return
+
+        error = task.exception()
+        if error is not None:
+            logger.error("Writer task failed", error=str(error))
+        else:
+            logger.warning("Writer task stopped")
 
-    async def _on_hint_token(self, event: HintToken) -> None:
-        """Handle hint token event."""
-        await self._send_json(event.model_dump())
+    async def _close(self) -> None:
+        """Close the socket after a failed send."""
+        try:
+            await self.websocket.close()
+        except Exception as e:
+            logger.debug("WebSocket already closed", error=str(e))
+
+    async def _coalesce_hint_tokens(self, first: HintToken) -> tuple[HintToken, Any]:
+        """
+        Merge hint tokens for the same hint into one frame.
+
+        Tokens already queued are merged right away. Only when that finds a
+        burst does the writer wait out the coalescing window for more, so a
+        lone token is sent without delay.
+
+        Returns the merged token and the first queued event that could not be
+        merged (or None), which the writer must send next to preserve order.
+        """
+        tokens = [first.token]
+        pending = self._merge_queued_tokens(first.hint_id, tokens)
+        if pending is None and len(tokens) > 1:
+            await asyncio.sleep(HINT_TOKEN_COALESCE_MS / 1000)
+            pending = self._merge_queued_tokens(first.hint_id, tokens)
+
+        if len(tokens) == 1:
+            return first, pending
+        return HintToken(hint_id=first.hint_id, token="".join(tokens)), pending
+
+    def _merge_queued_tokens(self, hint_id: str, tokens: list[str]) -> Any:
+        """
+        Move queued tokens for hint_id into tokens.
+
+        Stops at the first other event and returns it (or None once the
+        queue is empty).
+        """
+        queue = self.session.out_queue
+        while not queue.empty():
+            event = queue.get_nowait()
+            if isinstance(event, HintToken) and event.hint_id == hint_id:
+                tokens.append(event.token)
+            else:
+                return event
+        return None
 
-    async def _on_hint_completed(self, event: HintCompleted) -> None:
-        """Handle hint completed event."""
-        await self._send_json(event.model_dump())
+    async def _stop_writer(self) -> None:
+        """Stop the writer task."""
+        if self._writer_task:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
 
-    async def _send_status(self) -> None:
-        """Send session status."""
+    def _send_status(self) -> None:
+        """Queue session status if it changed since the last send."""
         if not self.session:
             return
 
-        status = SessionStatus(
+        # Values come from trusted server state; skip validation
+        status = SessionStatus.model_construct(
             connected=True,
             stt_mic_state="active" if self.session.state == SessionState.ACTIVE else "idle",
             stt_system_state="active" if self.session.state == SessionState.ACTIVE else "idle",
             llm_state="idle",
-            dropped_frames_count=self.session.stats.dropped_frames_count,
+            dropped_frames_count=self.session.stats.dropped_frames_total,
             hints_enabled=self.session.hints_enabled,
         )
-        await self._send_json(status.model_dump())
+        payload = status.model_dump_json()
+        if payload == self._last_status:
+            return
+
+        self._last_status = payload
+        self.session.send_event(payload)
 
     async def _send_error(self, message: str) -> None:
         """Send error message."""
         error = ErrorMessage(message=message)
-        await self._send_json(error.model_dump())
+        if self._writer_task:
+            self.session.send_event(error)
+        else:
+            await self._send_text(error.model_dump_json())
 
-    async def _send_json(self, data: dict) -> None:
-        """Send JSON message with lock."""
-        async with self._send_lock:
-            try:
-                await self.websocket.send_json(data)
-            except Exception as e:
-                logger.error("Failed to send message", error=str(e))
+    async def _send_text(self, payload: str) -> None:
+        """Send a text frame."""
+        try:
+            await self.websocket.send_text(payload)
+        except Exception as e:
+            logger.error("Failed to send message", error=str(e))
 
     async def _cleanup(self) -> None:
         """Cleanup on disconnect."""
-        # Unsubscribe from events
-        await self.event_bus.unsubscribe(EventType.TRANSCRIPT_DELTA, self._on_transcript_delta)
-        await self.event_bus.unsubscribe(EventType.TRANSCRIPT_COMPLETED, self._on_transcript_completed)
-        await self.event_bus.unsubscribe(EventType.HINT_TOKEN, self._on_hint_token)
-        await self.event_bus.unsubscribe(EventType.HINT_COMPLETED, self._on_hint_completed)
+        # Stop forwarding events
+        await self._stop_writer()
 
         # Destroy session
         if self.session:
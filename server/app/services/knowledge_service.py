@@ -1,19 +1,29 @@
 """Knowledge Service for managing and retrieving knowledge from .md files."""
 
+import asyncio
+import heapq
 import json
+import mmap
+import os
 import re
+import threading
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from collections import Counter
-from typing import List, Optional
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, List, Optional
 
+import numpy as np
 import structlog
+from scipy import sparse
 
 from app.config import MAX_CONTEXT_TOKENS
 
 logger = structlog.get_logger()
 
 # Common English stop words to filter out
-STOP_WORDS = {
+STOP_WORDS = frozenset({
     "a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for",
     "of", "with", "by", "from", "as", "is", "was", "are", "were", "been",
     "be", "have", "has", "had", "do", "does", "did", "will", "would",
@@ -24,32 +34,106 @@ STOP_WORDS = {
     "why", "how", "all", "each", "every", "both", "few", "more", "most",
     "other", "some", "such", "no", "nor", "not", "only", "own", "same",
     "so", "than", "too", "very", "just", "also", "now", "here", "there",
-}
+})
+
+# Word tokens (applied to lowercased text)
+TOKEN_PATTERN = re.compile(r"\b[a-z]{3,}\b")
+
+# Same tokens matched on original-case text, where offsets must stay valid
+# (str.lower() can change the length of some non-ASCII text)
+WORD_PATTERN = re.compile(r"\b[A-Za-z]{3,}\b")
+
+# Byte-level tokenizing for ASCII text: a translate() table lowercases at
+# memcpy speed and byte offsets equal str offsets
+ASCII_LOWER = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+ASCII_TOKEN_PATTERN = re.compile(rb"\b[a-z]{3,}\b")
+ASCII_STOP_WORDS = frozenset(word.encode("ascii") for word in STOP_WORDS)
+
+# First markdown heading, matched on raw file bytes
+TITLE_PATTERN = re.compile(rb"^#\s+(.+)$", re.MULTILINE)
 
 WORKSPACES_DIR = Path("./workspaces")
+INDEX_DIR_NAME = ".index"
+INDEX_FORMAT = 2  # Bump when the on-disk layout changes; older indexes are rebuilt
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def count_terms(text: str) -> Counter:
+    """Count non-stop-word terms in text."""
+    # Tokenize: extract words
+    words = TOKEN_PATTERN.findall(text.lower())
+
+    # Filter stop words and count frequencies
+    return Counter(w for w in words if w not in STOP_WORDS)
+
+
+def top_terms(counter: Counter, top_n: int) -> List[str]:
+    """Return the top N most frequent terms (O(V log N) heap selection)."""
+    return [word for word, _ in heapq.nlargest(top_n, counter.items(), key=itemgetter(1))]
+
+
+def _tokenize_with_positions(text: str) -> List[tuple[str, int]]:
+    """Return (lowercased term, offset) for each non-stop-word token in text."""
+    terms = []
+
+    if text.isascii():
+        # Only tokens that survive the stop-word filter are decoded
+        lowered = text.encode("ascii").translate(ASCII_LOWER)
+        for match in ASCII_TOKEN_PATTERN.finditer(lowered):
+            term = match.group()
+            if term not in ASCII_STOP_WORDS:
+                terms.append((term.decode("ascii"), match.start()))
+        return terms
+
+    for match in WORD_PATTERN.finditer(text):
+        term = match.group().lower()
+        if term not in STOP_WORDS:
+            terms.append((term, match.start()))
+    return terms
+
+
+@lru_cache(maxsize=4096)
+def _extract_keywords_cached(text: str, top_n: int) -> tuple[str, ...]:
+    return tuple(top_terms(count_terms(text), top_n))
 
 
 def extract_keywords(text: str, top_n: int = 50) -> List[str]:
     """Extract top N keywords from text."""
-    # Tokenize: extract words
-    words = re.findall(r"\b[a-zA-Z]{3,}\b", text.lower())
+    return list(_extract_keywords_cached(text, top_n))
 
-    # Filter stop words
-    words = [w for w in words if w not in STOP_WORDS]
 
-    # Count frequencies
-    counter = Counter(words)
+# Sentence boundaries in order of preference when cutting a chunk
+CHUNK_BOUNDARIES = (".", "!", "?", "\n\n")
 
-    # Return top N
-    return [word for word, _ in counter.most_common(top_n)]
+# One scan finds every boundary: its first character, with the rest as lookahead
+# so that overlapping boundaries ("\n\n\n") are all reported
+BOUNDARY_PATTERN = re.compile("|".join(
+    re.escape(punct[0]) + (f"(?={re.escape(punct[1:])})" if len(punct) > 1 else "")
+    for punct in CHUNK_BOUNDARIES
+))
 
 
-def chunk_text(text: str, max_chars: int = 1000, overlap: int = 100) -> List[str]:
-    """Split text into overlapping chunks."""
+def _boundary_positions(text: str) -> List[tuple[int, List[int]]]:
+    """Locate every chunk boundary in one regex pass.
+
+    Returns (boundary length, sorted start offsets) per CHUNK_BOUNDARIES entry.
+    """
+    positions = {punct[0]: [] for punct in CHUNK_BOUNDARIES}
+    for match in BOUNDARY_PATTERN.finditer(text):
+        positions[match.group()].append(match.start())
+    return [(len(punct), positions[punct[0]]) for punct in CHUNK_BOUNDARIES]
+
+
+def chunk_spans(text: str, max_chars: int = 1000, overlap: int = 100) -> List[tuple[int, int]]:
+    """Return (start, end) offsets of overlapping chunks of text."""
     if len(text) <= max_chars:
-        return [text]
+        return [(0, len(text))]
 
-    chunks = []
+    boundaries = _boundary_positions(text)
+    spans = []
     start = 0
 
     while start < len(text):
@@ -57,17 +141,26 @@ def chunk_text(text: str, max_chars: int = 1000, overlap: int = 100) -> List[str
 
         # Try to break at sentence boundary
         if end < len(text):
-            # Look for sentence end near the boundary
-            for punct in [".", "!", "?", "\n\n"]:
-                last_punct = text.rfind(punct, start + max_chars // 2, end)
-                if last_punct > start:
-                    end = last_punct + 1
+            # Look for the last sentence end in the second half of the window
+            lo = start + max_chars // 2
+            for length, positions in boundaries:
+                i = bisect_right(positions, end - length) - 1
+                if i >= 0 and positions[i] >= lo:
+                    end = positions[i] + 1
                     break
 
-        chunks.append(text[start:end].strip())
+        spans.append((start, min(end, len(text))))
         start = end - overlap
 
-    return chunks
+    return spans
+
+
+def chunk_text(text: str, max_chars: int = 1000, overlap: int = 100) -> List[str]:
+    """Split text into overlapping chunks."""
+    if len(text) <= max_chars:
+        return [text]
+
+    return [text[start:end].strip() for start, end in chunk_spans(text, max_chars, overlap)]
 
 
 class FileIndex:
@@ -77,29 +170,215 @@ class FileIndex:
         self.filename = filename
         self.title = title
         self.keywords = set(keywords)
-        self.chunks = chunks  # List of {"text": str, "keywords": set}
+        self.chunks = chunks  # List of {"text": str, "terms": {term: count}}
 
     def to_dict(self) -> dict:
+        """File metadata; chunk text and terms are stored in the workspace index."""
         return {
             "filename": self.filename,
             "title": self.title,
             "keywords": list(self.keywords),
-            "chunks": [
-                {"text": c["text"], "keywords": list(c["keywords"])}
-                for c in self.chunks
-            ]
         }
 
+
+class ChunkTexts:
+    """Chunk texts stored as one concatenated UTF-8 blob plus offsets.
+
+    The blob is bytes for a freshly built index and an mmap for a loaded
+    one; text is only decoded for chunks that are actually returned.
+    """
+
+    def __init__(self, blob, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_texts(cls, texts: List[str]) -> "ChunkTexts":
+        encoded = [text.encode("utf-8") for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(b"".join(encoded), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, chunk_id: int) -> str:
+        return self.blob[self.offsets[chunk_id]:self.offsets[chunk_id + 1]].decode("utf-8")
+
+
+class WorkspaceIndex:
+    """BM25 index over all chunks in a workspace.
+
+    Chunks are rows of a sparse (n_chunks, vocab) matrix holding precomputed
+    BM25 term weights. The matrix is stored column-major (CSC), so each term
+    column is its posting list and a query only reads the columns of its terms.
+
+    On disk the index is a directory of flat .npy arrays plus a chunks.bin
+    text blob; loading memory-maps them instead of parsing anything.
+    """
+
+    def __init__(
+        self,
+        files: List[dict],
+        vocab: List[str],
+        weights: sparse.csc_matrix,
+        chunk_files: np.ndarray,
+        chunk_texts: ChunkTexts,
+        idf: Optional[np.ndarray] = None,
+    ):
+        self.files = files
+        self.vocab = {term: i for i, term in enumerate(vocab)}
+        self.weights = weights
+
+        # Chunk ID -> position in self.files, and chunk ID -> text
+        self.chunk_files = chunk_files
+        self.chunk_texts = chunk_texts
+
+        if idf is None:
+            # IDF from document frequency (posting list length per term)
+            n_chunks = weights.shape[0]
+            df = np.diff(weights.indptr)
+            idf = np.log1p((n_chunks - df + 0.5) / (df + 0.5)).astype(np.float32)
+        self.idf = idf
+
+    def __len__(self) -> int:
+        return self.weights.shape[0]
+
+    def chunk(self, chunk_id: int) -> tuple[str, str]:
+        """Return (filename, text) for a chunk."""
+        return self.files[self.chunk_files[chunk_id]]["filename"], self.chunk_texts[chunk_id]
+
+    @classmethod
+    def build(cls, file_indices: List[FileIndex]) -> "WorkspaceIndex":
+        """Build the index from freshly indexed files."""
+        vocab, weights = cls._build_matrix(file_indices)
+        chunk_files = np.repeat(
+            np.arange(len(file_indices), dtype=np.int32),
+            [len(f.chunks) for f in file_indices],
+        )
+        chunk_texts = ChunkTexts.from_texts(
+            [chunk["text"] for f in file_indices for chunk in f.chunks]
+        )
+
+        return cls([f.to_dict() for f in file_indices], vocab, weights, chunk_files, chunk_texts)
+
+    @staticmethod
+    def _build_matrix(files: List[FileIndex]) -> tuple[List[str], sparse.csc_matrix]:
+        """Build the vocabulary and BM25 weight matrix from per-chunk term counts."""
+        vocab: dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        tfs: List[int] = []
+        doc_len: List[int] = []
+
+        for file_index in files:
+            for chunk in file_index.chunks:
+                for term, tf in chunk["terms"].items():
+                    indices.append(vocab.setdefault(term, len(vocab)))
+                    tfs.append(tf)
+                indptr.append(len(indices))
+                doc_len.append(sum(chunk["terms"].values()))
+
+        tf = np.asarray(tfs, dtype=np.float64)
+        lengths = np.asarray(doc_len, dtype=np.float64)
+        avgdl = lengths.mean() if len(lengths) else 0.0
+
+        # Per-entry BM25 term weight: tf saturation with length normalization
+        row_len = np.repeat(lengths, np.diff(indptr))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * row_len / avgdl) if avgdl else BM25_K1
+        # float32 halves the bytes streamed per query; scores don't need more precision
+        data = (tf * (BM25_K1 + 1) / (tf + norm)).astype(np.float32)
+
+        # Assembled by chunk, stored by term
+        weights = sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+            shape=(len(doc_len), len(vocab)),
+        ).tocsc()
+        return list(vocab), weights
+
+    def search(self, terms: List[str], top_k: int) -> List[tuple[int, float]]:
+        """Return the top K (chunk ID, BM25 score) pairs for the query terms."""
+        term_ids = [self.vocab[term] for term in terms if term in self.vocab]
+        if not term_ids:
+            return []
+
+        # Gather the query terms' posting lists and accumulate idf-scaled
+        # weights per chunk; chunks outside them are never read
+        indptr, indices, data = self.weights.indptr, self.weights.indices, self.weights.data
+        postings = [slice(indptr[t], indptr[t + 1]) for t in term_ids]
+        chunk_ids = np.concatenate([indices[p] for p in postings])
+        contributions = np.concatenate([data[p] * self.idf[t] for p, t in zip(postings, term_ids)])
+
+        scores = np.bincount(chunk_ids, weights=contributions, minlength=len(self))
+
+        # Partial sort: only the top K candidates are ordered
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+    def save(self, index_dir: Path) -> None:
+        """Write the index as flat arrays plus a chunk text blob."""
+        index_dir.mkdir(exist_ok=True)
+
+        def write(name: str, writer: Callable) -> None:
+            # Replace instead of overwriting in place: an older index may still
+            # have the previous file memory-mapped
+            tmp_path = index_dir / f"{name}.tmp"
+            with open(tmp_path, "wb") as f:
+                writer(f)
+            os.replace(tmp_path, index_dir / name)
+
+        write("chunks.bin", lambda f: f.write(self.chunk_texts.blob))
+
+        arrays = {
+            "offsets": self.chunk_texts.offsets,
+            "chunk_files": self.chunk_files,
+            "data": self.weights.data,
+            "indices": self.weights.indices,
+            "indptr": self.weights.indptr,
+            "idf": self.idf,
+        }
+        for name, array in arrays.items():
+            write(f"{name}.npy", lambda f, array=array: np.save(f, array))
+
+        # Written last: a directory without meta.json is treated as incomplete
+        meta = {"format": INDEX_FORMAT, "files": self.files, "vocab": list(self.vocab)}
+        write("meta.json", lambda f: f.write(json.dumps(meta).encode("utf-8")))
+
     @classmethod
-    def from_dict(cls, data: dict) -> "FileIndex":
+    def load(cls, index_dir: Path) -> "WorkspaceIndex":
+        """Memory-map an index written by save()."""
+        with open(index_dir / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta.get("format") != INDEX_FORMAT:
+            raise ValueError(f"Unsupported index format: {meta.get('format')}")
+
+        def load_array(name: str) -> np.ndarray:
+            return np.load(index_dir / f"{name}.npy", mmap_mode="r")
+
+        offsets = load_array("offsets")
+        weights = sparse.csc_matrix(
+            (load_array("data"), load_array("indices"), load_array("indptr")),
+            shape=(len(offsets) - 1, len(meta["vocab"])),
+            copy=False,
+        )
+
+        # mmap cannot map an empty file
+        blob = b""
+        with open(index_dir / "chunks.bin", "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
         return cls(
-            filename=data["filename"],
-            title=data["title"],
-            keywords=data["keywords"],
-            chunks=[
-                {"text": c["text"], "keywords": set(c["keywords"])}
-                for c in data["chunks"]
-            ]
+            files=meta["files"],
+            vocab=meta["vocab"],
+            weights=weights,
+            chunk_files=load_array("chunk_files"),
+            chunk_texts=ChunkTexts(blob, offsets),
+            idf=load_array("idf"),
         )
 
 
@@ -107,56 +386,89 @@ class KnowledgeService:
     """Service for managing knowledge files and retrieval."""
 
     def __init__(self):
-        self._index_cache: dict[str, List[FileIndex]] = {}
+        self._index_cache: dict[str, WorkspaceIndex] = {}
+
+        # Guards index builds and cache writes; retrieval runs in worker threads
+        self._lock = threading.RLock()
 
     def index_workspace(self, workspace: str) -> None:
         """Index all files in a workspace."""
-        workspace_path = WORKSPACES_DIR / workspace
+        with self._lock:
+            workspace_path = WORKSPACES_DIR / workspace
 
-        if not workspace_path.exists():
-            logger.warning("Workspace not found", workspace=workspace)
-            return
+            if not workspace_path.exists():
+                logger.warning("Workspace not found", workspace=workspace)
+                return
 
-        indices = []
+            indices = []
 
-        for file_path in workspace_path.glob("*.md"):
-            try:
-                index = self._index_file(file_path)
-                indices.append(index)
-                logger.info("Indexed file",
-                           workspace=workspace,
-                           filename=file_path.name)
-            except Exception as e:
-                logger.error("Failed to index file",
-                            filename=file_path.name,
-                            error=str(e))
+            for file_path in workspace_path.glob("*.md"):
+                try:
+                    index = self._index_file(file_path)
+                    indices.append(index)
+                    logger.info("Indexed file",
+                               workspace=workspace,
+                               filename=file_path.name)
+                except Exception as e:
+                    logger.error("Failed to index file",
+                                filename=file_path.name,
+                                error=str(e))
 
-        self._index_cache[workspace] = indices
+            index = WorkspaceIndex.build(indices)
+            self._index_cache[workspace] = index
 
-        # Save index to disk
-        self._save_index(workspace, indices)
+            # Save index to disk
+            self._save_index(workspace, index)
 
     def _index_file(self, file_path: Path) -> FileIndex:
         """Index a single markdown file."""
-        content = file_path.read_text(encoding="utf-8")
-
-        # Extract title (first heading or filename)
         title = file_path.stem
-        title_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-        if title_match:
-            title = title_match.group(1).strip()
-
-        # Extract keywords from full content
-        keywords = extract_keywords(content)
-
-        # Create chunks
-        chunks = []
-        for chunk_text_content in chunk_text(content):
-            chunk_keywords = extract_keywords(chunk_text_content, top_n=20)
-            chunks.append({
-                "text": chunk_text_content,
-                "keywords": set(chunk_keywords)
-            })
+        content = ""
+
+        # Map the file instead of reading it: the title is found on the raw
+        # bytes and the text is decoded straight from the mapping, so no
+        # intermediate bytes copy of the file is made
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Extract title (first heading or filename)
+                    title_match = TITLE_PATTERN.search(mm)
+                    if title_match:
+                        title = title_match.group(1).decode("utf-8").strip()
+
+                    content = str(mm, "utf-8")
+
+                    # Universal newlines, as read_text() gave: paragraph
+                    # boundaries are found on "\n\n"
+                    if mm.find(b"\r") != -1:
+                        content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+        # One tokenization pass feeds both the file keywords and the per-chunk
+        # term frequencies for BM25; a token counts toward every (overlapping)
+        # chunk whose span contains it
+        spans = chunk_spans(content)
+        starts = [start for start, _ in spans]
+        ends = [end for _, end in spans]
+
+        file_terms: Counter = Counter()
+        chunk_terms: List[Counter] = [Counter() for _ in spans]
+
+        for term, pos in _tokenize_with_positions(content):
+            file_terms[term] += 1
+            for chunk_id in range(bisect_left(ends, pos + len(term)), bisect_right(starts, pos)):
+                chunk_terms[chunk_id][term] += 1
+
+        keywords = top_terms(file_terms, 50)
+
+        # Same texts as chunk_text(), cut from the spans computed above
+        if len(spans) == 1:
+            texts = [content]
+        else:
+            texts = [content[start:end].strip() for start, end in spans]
+        chunks = [
+            {"text": text, "terms": dict(terms)}
+            for text, terms in zip(texts, chunk_terms)
+        ]
 
         return FileIndex(
             filename=file_path.name,
@@ -165,77 +477,68 @@ class KnowledgeService:
             chunks=chunks
         )
 
-    def _save_index(self, workspace: str, indices: List[FileIndex]) -> None:
+    def _save_index(self, workspace: str, index: WorkspaceIndex) -> None:
         """Save index to disk."""
         workspace_path = WORKSPACES_DIR / workspace
-        index_path = workspace_path / ".index.json"
+        index_dir = workspace_path / INDEX_DIR_NAME
 
-        data = [idx.to_dict() for idx in indices]
+        # Invalidate first so a partially written index is never loaded
+        (index_dir / "meta.json").unlink(missing_ok=True)
+        index.save(index_dir)
 
-        with open(index_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        # Drop files from the previous JSON-based format
+        for legacy in (".index.json", ".index.npz"):
+            (workspace_path / legacy).unlink(missing_ok=True)
 
-    def _load_index(self, workspace: str) -> Optional[List[FileIndex]]:
+    def _load_index(self, workspace: str) -> Optional[WorkspaceIndex]:
         """Load index from disk."""
         workspace_path = WORKSPACES_DIR / workspace
-        index_path = workspace_path / ".index.json"
+        index_dir = workspace_path / INDEX_DIR_NAME
 
-        if not index_path.exists():
+        if not (index_dir / "meta.json").exists():
             return None
 
         try:
-            with open(index_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return [FileIndex.from_dict(d) for d in data]
+            return WorkspaceIndex.load(index_dir)
         except Exception as e:
             logger.error("Failed to load index", error=str(e))
             return None
 
-    def _get_index(self, workspace: str) -> List[FileIndex]:
+    def _get_index(self, workspace: str) -> Optional[WorkspaceIndex]:
         """Get index for workspace, loading or creating if needed."""
-        if workspace in self._index_cache:
-            return self._index_cache[workspace]
-
-        # Try to load from disk
-        indices = self._load_index(workspace)
-        if indices:
-            self._index_cache[workspace] = indices
-            return indices
-
-        # Create new index
-        self.index_workspace(workspace)
-        return self._index_cache.get(workspace, [])
+        index = self._index_cache.get(workspace)
+        if index is not None:
+            return index
+
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            index = self._index_cache.get(workspace)
+            if index is not None:
+                return index
+
+            # Try to load from disk
+            index = self._load_index(workspace)
+            if index is not None:
+                self._index_cache[workspace] = index
+                return index
+
+            # Create new index
+            self.index_workspace(workspace)
+            return self._index_cache.get(workspace)
 
     def retrieve(self, workspace: str, query: str, top_k: int = 3) -> str:
         """Retrieve relevant chunks for a query."""
-        indices = self._get_index(workspace)
-        if not indices:
+        index = self._get_index(workspace)
+        if not index or not len(index):
             return ""
 
         # Extract query keywords
-        query_keywords = set(extract_keywords(query, top_n=10))
+        query_keywords = extract_keywords(query, top_n=10)
         if not query_keywords:
             return ""
 
-        # Score all chunks
-        scored_chunks = []
-
-        for file_index in indices:
-            for chunk in file_index.chunks:
-                # Calculate overlap score
-                overlap = len(query_keywords & chunk["keywords"])
-                if overlap > 0:
-                    scored_chunks.append({
-                        "text": chunk["text"],
-                        "score": overlap,
-                        "filename": file_index.filename,
-                    })
-
-        # Sort by score
-        scored_chunks.sort(key=lambda x: x["score"], reverse=True)
-
-        # Take top K
-        top_chunks = scored_chunks[:top_k]
+        # Rank chunks by BM25 score
+        top_chunks = index.search(query_keywords, top_k)
 
         if not top_chunks:
             return ""
@@ -245,8 +548,8 @@ class KnowledgeService:
         total_chars = 0
         max_chars = MAX_CONTEXT_TOKENS * 4  # Rough char to token ratio
 
-        for chunk in top_chunks:
-            text = chunk["text"]
+        for chunk_id, _ in top_chunks:
+            filename, text = index.chunk(chunk_id)
             if total_chars + len(text) > max_chars:
                 # Truncate this chunk
                 remaining = max_chars - total_chars
@@ -255,11 +558,21 @@ class KnowledgeService:
                 else:
                     break
 
-            context_parts.append(f"[From {chunk['filename']}]\n{text}")
+            context_parts.append(f"[From {filename}]\n{text}")
             total_chars += len(text)
 
         return "\n\n".join(context_parts)
 
+    async def retrieve_async(self, workspace: str, query: str, top_k: int = 3) -> str:
+        """Retrieve relevant chunks in a worker thread, keeping the event loop free."""
+        return await asyncio.to_thread(self.retrieve, workspace, query, top_k)
+
+    def invalidate(self, workspace: str) -> None:
+        """Drop the index for a workspace so the next retrieval rebuilds it."""
+        with self._lock:
+            self._index_cache.pop(workspace, None)
+            (WORKSPACES_DIR / workspace / INDEX_DIR_NAME / "meta.json").unlink(missing_ok=True)
+
     def get_workspace_files(self, workspace: str) -> List[str]:
         """Get list of files in workspace."""
         workspace_path = WORKSPACES_DIR / workspace
@@ -268,3 +581,15 @@ class KnowledgeService:
             return []
 
         return [f.name for f in workspace_path.glob("*.md")]
+
+
+# Process-wide instance so sessions share loaded workspace indexes
+_knowledge_service: Optional[KnowledgeService] = None
+
+
+def get_knowledge_service() -> KnowledgeService:
+    """Get the shared knowledge service, creating it on first use."""
+    global _knowledge_service
+    if _knowledge_service is None:
+        _knowledge_service = KnowledgeService()
+    return _knowledge_service
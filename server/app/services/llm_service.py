@@ -2,16 +2,17 @@
 
 import asyncio
 import uuid
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import httpx
+import orjson
 import structlog
 
 from app.config import get_settings, MAX_HINT_POINTS
-from app.models.session import Session, SessionState, SessionMode
+from app.models.session import Session, SessionMode
 from app.models.events import TextChunk, HintToken, HintCompleted
 from app.utils.event_bus import EventBus, EventType
-from app.services.knowledge_service import KnowledgeService
+from app.services.knowledge_service import get_knowledge_service
 
 logger = structlog.get_logger()
 
@@ -38,19 +39,44 @@ Output ONLY bullet points starting with "- ".
 {knowledge_context}"""
 
 
+async def _iter_sse_data(response: httpx.Response) -> AsyncIterator[bytearray]:
+    """Yield the payload of each SSE "data: " line of a streaming response.
+
+    Works on raw bytes: lines are located with find() in a reusable buffer
+    and only the payload is sliced out, with no per-line str decoding.
+    """
+    buffer = bytearray()
+
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        start = 0
+
+        while (end := buffer.find(b"\n", start)) != -1:
+            if buffer.startswith(b"data: ", start, end):
+                # Tolerate CRLF line endings
+                data_end = end - 1 if buffer[end - 1] == 0x0D else end
+                yield buffer[start + 6:data_end]
+            start = end + 1
+
+        del buffer[:start]
+
+
 class LLMService:
     """Service for generating hints using Ollama LLM."""
 
-    def __init__(self, session: Session, event_bus: EventBus):
+    def __init__(self, session: Session, event_bus: EventBus, http_client: httpx.AsyncClient):
         self.session = session
         self.event_bus = event_bus
-        self.knowledge_service = KnowledgeService()
+        self.http_client = http_client
+        self.knowledge_service = get_knowledge_service()
 
         self._running = False
         self._generating = False
         self._cancel_event = asyncio.Event()
         self._current_hint_id: Optional[str] = None
-        self._pending_chunk: Optional[TextChunk] = None
+
+        # Single slot for the next chunk to answer (latest wins)
+        self._queue: asyncio.Queue[TextChunk] = asyncio.Queue(maxsize=1)
 
     async def run(self) -> None:
         """Run the LLM service."""
@@ -61,8 +87,10 @@ class LLMService:
 
             self._running = True
 
-            while self._running and self.session.state == SessionState.ACTIVE:
-                await asyncio.sleep(0.1)
+            # Generate hints one at a time for queued chunks
+            while self._running:
+                chunk = await self._queue.get()
+                await self._generate_hint(chunk)
 
         except asyncio.CancelledError:
             pass
@@ -76,18 +104,14 @@ class LLMService:
         if not self.session.hints_enabled:
             return
 
-        if self._generating:
-            # Handle based on mode
-            if self.session.mode == SessionMode.INTERVIEW_ASSISTANT:
-                # Cancel current and start new (new question is priority)
-                self._cancel_event.set()
-                self._pending_chunk = chunk
-            else:
-                # Latest wins - just replace pending
-                self._pending_chunk = chunk
-            return
+        if self._generating and self.session.mode == SessionMode.INTERVIEW_ASSISTANT:
+            # Cancel current and start new (new question is priority)
+            self._cancel_event.set()
 
-        await self._generate_hint(chunk)
+        # Latest wins - replace any chunk still waiting
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(chunk)
 
     async def _generate_hint(self, chunk: TextChunk) -> None:
         """Generate a hint for the given chunk."""
@@ -104,7 +128,7 @@ class LLMService:
             # Get knowledge context if workspace is set
             knowledge_context = ""
             if self.session.knowledge_workspace:
-                knowledge_context = self.knowledge_service.retrieve(
+                knowledge_context = await self.knowledge_service.retrieve_async(
                     self.session.knowledge_workspace,
                     chunk.text
                 )
@@ -152,53 +176,45 @@ class LLMService:
             # Stream from Ollama
             url = f"{settings.ollama_base_url}/v1/chat/completions"
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                async with client.stream(
-                    "POST",
-                    url,
-                    json={
-                        "model": settings.ollama_model,
-                        "messages": messages,
-                        "stream": True,
-                        "options": {
-                            "temperature": 0.7,
-                            "top_p": 0.9,
-                        }
+            async with self.http_client.stream(
+                "POST",
+                url,
+                json={
+                    "model": settings.ollama_model,
+                    "messages": messages,
+                    "stream": True,
+                    "options": {
+                        "temperature": 0.7,
+                        "top_p": 0.9,
                     }
-                ) as response:
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        logger.error("Ollama error", status=response.status_code, body=error_text)
+                }
+            ) as response:
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    logger.error("Ollama error", status=response.status_code, body=error_text)
+                    return
+
+                async for data in _iter_sse_data(response):
+                    # Check for cancellation
+                    if self._cancel_event.is_set():
+                        logger.info("Hint generation cancelled", hint_id=hint_id)
                         return
 
-                    async for line in response.aiter_lines():
-                        # Check for cancellation
-                        if self._cancel_event.is_set():
-                            logger.info("Hint generation cancelled", hint_id=hint_id)
-                            return
-
-                        if not line or not line.startswith("data: "):
-                            continue
+                    if data == b"[DONE]":
+                        break
 
-                        data = line[6:]  # Remove "data: " prefix
-                        if data == "[DONE]":
-                            break
+                    try:
+                        token = orjson.loads(data)["choices"][0]["delta"].get("content")
+                    except (orjson.JSONDecodeError, LookupError, TypeError, AttributeError) as e:
+                        logger.debug("Parse error", error=str(e), data=bytes(data))
+                        continue
 
-                        try:
-                            import json
-                            chunk_data = json.loads(data)
-                            delta = chunk_data.get("choices", [{}])[0].get("delta", {})
-                            token = delta.get("content", "")
+                    if token:
+                        collected_text += token
 
-                            if token:
-                                collected_text += token
-
-                                # Send token event
-                                event = HintToken(hint_id=hint_id, token=token)
-                                await self.event_bus.publish(EventType.HINT_TOKEN, event)
-
-                        except Exception as e:
-                            logger.debug("Parse error", error=str(e), line=line)
+                        # Send token event
+                        event = HintToken(hint_id=hint_id, token=token)
+                        self.session.send_event(event)
 
             # Format and send completed hint
             if collected_text and not self._cancel_event.is_set():
@@ -210,7 +226,7 @@ class LLMService:
                     final_text=formatted,
                     mode=self.session.mode.value,
                 )
-                await self.event_bus.publish(EventType.HINT_COMPLETED, event)
+                self.session.send_event(event)
 
                 logger.info("Hint generated",
                            hint_id=hint_id,
@@ -226,12 +242,6 @@ class LLMService:
             self._generating = False
             self._current_hint_id = None
 
-            # Process pending chunk if any
-            if self._pending_chunk:
-                chunk = self._pending_chunk
-                self._pending_chunk = None
-                await self._generate_hint(chunk)
-
     def _format_hint(self, text: str) -> str:
         """Format hint to ensure 1-3 bullet points."""
         lines = text.strip().split("\n")
@@ -5,6 +5,8 @@ import re
 import time
 from collections import deque
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from typing import Optional
 
 import structlog
@@ -25,45 +27,78 @@ from app.utils.event_bus import EventBus, EventType
 
 logger = structlog.get_logger()
 
-# Question detection patterns
+# Completed segments kept for context
+HISTORY_SIZE = 20
+
+# Trigger thresholds in time.monotonic_ns() units
+AGGREGATION_TIMEOUT_NS = AGGREGATION_TIMEOUT_MS * 1_000_000
+HINT_RATE_LIMIT_NS = HINT_RATE_LIMIT_MS * 1_000_000
+
+# Question detection: phrases that open a question or invitation to speak
 QUESTION_WORDS = [
-    r"^what\b",
-    r"^why\b",
-    r"^how\b",
-    r"^when\b",
-    r"^where\b",
-    r"^who\b",
-    r"^which\b",
-    r"^can you\b",
-    r"^could you\b",
-    r"^would you\b",
-    r"^tell me\b",
-    r"^explain\b",
-    r"^describe\b",
-    r"^walk me through\b",
-    r"^give me an example\b",
+    "what",
+    "why",
+    "how",
+    "when",
+    "where",
+    "who",
+    "which",
+    "can you",
+    "could you",
+    "would you",
+    "tell me",
+    "explain",
+    "describe",
+    "walk me through",
+    "give me an example",
 ]
 
-QUESTION_PATTERNS = [re.compile(p, re.IGNORECASE) for p in QUESTION_WORDS]
 
+def _trie_alternation(phrases: list[str]) -> str:
+    """
+    Build a regex alternation with shared prefixes factored out.
 
-def is_question(text: str) -> bool:
-    """Detect if text is a question or invitation to speak."""
-    text = text.strip()
+    "what|when|where" becomes "wh(?:at|e(?:n|re))", so the regex engine
+    tests each leading character once instead of retrying every phrase.
+    """
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of phrase
 
-    # Check for question mark
-    if "?" in text:
-        return True
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if "" in node else pattern
 
-    # Check for question words at start
-    for pattern in QUESTION_PATTERNS:
-        if pattern.search(text):
-            return True
+    return build(trie)
 
-    return False
 
+# All phrases fused into one prefix-factored alternation so a single match
+# covers them; leading whitespace is skipped by the pattern rather than by strip()
+QUESTION_PATTERN = re.compile(
+    r"^\s*" + _trie_alternation(QUESTION_WORDS) + r"\b",
+    re.IGNORECASE,
+)
 
-@dataclass
+
+@lru_cache(maxsize=1024)
+def is_question(text: str) -> bool:
+    """Detect if text is a question or invitation to speak (memoized)."""
+    # Question mark anywhere, or a question word at the start
+    return "?" in text or QUESTION_PATTERN.match(text) is not None
+
+
+def is_question_batch(texts: list[str]) -> list[bool]:
+    """Classify many texts in one call, e.g. when re-scoring transcript logs."""
+    return list(map(is_question, texts))
+
+
+@dataclass(slots=True)
 class TranscriptSegment:
     """A transcript segment with metadata."""
     speaker: Speaker
@@ -73,6 +108,23 @@ class TranscriptSegment:
     is_complete: bool = False
 
 
+@dataclass(slots=True)
+class _SegmentText:
+    """Delta texts of an in-progress segment with a running word count."""
+    parts: list = field(default_factory=list)
+    words: int = 0
+    in_word: bool = False  # Last delta ended mid-word
+
+    def append(self, text: str) -> None:
+        """Add a non-empty delta, counting only the words it adds."""
+        words = len(text.split())
+        if words and self.in_word and not text[0].isspace():
+            words -= 1  # Its first word continues the previous delta's last
+        self.words += words
+        self.in_word = not text[-1].isspace()
+        self.parts.append(text)
+
+
 @dataclass
 class TextAggregator:
     """Aggregates transcript deltas into stable chunks."""
@@ -80,36 +132,69 @@ class TextAggregator:
     # Current segments being built (by segment_id)
     current_segments: dict = field(default_factory=dict)
 
-    # History of completed segments
-    history: deque = field(default_factory=lambda: deque(maxlen=20))
+    # History of completed segments (oldest first; appending past
+    # HISTORY_SIZE evicts the oldest)
+    history: deque = field(default_factory=lambda: deque(maxlen=HISTORY_SIZE))
+
+    # The same segments bucketed by speaker, so a speaker's latest ones
+    # are read without filtering the shared history
+    _speaker_history: dict = field(
+        default_factory=lambda: {speaker: deque(maxlen=HISTORY_SIZE) for speaker in Speaker},
+        init=False,
+        repr=False,
+    )
 
-    # Accumulated text for current speaker
-    pending_text: str = ""
+    # Current speaker's pending segment (its text is `pending_text`)
     pending_speaker: Optional[Speaker] = None
     pending_segment_id: Optional[str] = None
-    last_delta_time: float = 0
+    last_delta_time: int = 0  # time.monotonic_ns()
+
+    # Delta texts per in-progress segment, joined on demand rather than
+    # concatenated per delta; the pending segment's texts and their join
+    _segment_texts: dict = field(default_factory=dict, init=False, repr=False)
+    _pending: Optional[_SegmentText] = field(default=None, init=False, repr=False)
+    _pending_text: Optional[str] = field(default="", init=False, repr=False)
+
+    # Rendered global contexts, valid until history changes
+    _global_context_cache: dict = field(default_factory=dict, init=False, repr=False)
 
     def add_delta(self, event: TranscriptDelta) -> None:
         """Add a transcript delta."""
         segment_id = event.segment_id
 
-        if segment_id not in self.current_segments:
+        # In-progress segments get their text on completion
+        texts = self._segment_texts.get(segment_id)
+        if texts is None:
             self.current_segments[segment_id] = TranscriptSegment(
                 speaker=event.speaker,
                 text="",
                 segment_id=segment_id,
                 timestamp=event.timestamp,
             )
+            texts = self._segment_texts[segment_id] = _SegmentText()
 
         segment = self.current_segments[segment_id]
-        segment.text += event.text
-        self.last_delta_time = time.time()
+        if event.text:
+            texts.append(event.text)
+        self.last_delta_time = time.monotonic_ns()
 
         # Update pending
-        self.pending_text = segment.text
+        self._pending = texts
+        self._pending_text = None
         self.pending_speaker = segment.speaker
         self.pending_segment_id = segment_id
 
+    @property
+    def pending_text(self) -> str:
+        """Accumulated text of the pending segment (joined once per change)."""
+        if self._pending_text is None:
+            self._pending_text = "".join(self._pending.parts)
+        return self._pending_text
+
+    def _has_pending(self) -> bool:
+        """Check for pending text without joining it."""
+        return self._pending is not None and bool(self._pending.parts)
+
     def complete_segment(self, event: TranscriptCompleted) -> Optional[TranscriptSegment]:
         """Complete a segment and return it."""
         segment_id = event.segment_id
@@ -117,6 +202,7 @@ class TextAggregator:
         # Create or update segment
         if segment_id in self.current_segments:
             segment = self.current_segments.pop(segment_id)
+            del self._segment_texts[segment_id]
             segment.text = event.text
             segment.is_complete = True
         else:
@@ -128,34 +214,33 @@ class TextAggregator:
                 is_complete=True,
             )
 
-        # Add to history
+        # Add to history (bounded deques evict the oldest segment)
         self.history.append(segment)
+        self._speaker_history[segment.speaker].append(segment)
+        self._global_context_cache.clear()
 
         # Clear pending if this was the pending segment
         if self.pending_segment_id == segment_id:
-            self.pending_text = ""
-            self.pending_speaker = None
-            self.pending_segment_id = None
+            self.clear_pending()
 
         return segment
 
     def get_last_context(self, speaker: Speaker, sentences: int = 2) -> str:
         """Get last N sentences from speaker."""
-        texts = []
-        for segment in reversed(self.history):
-            if segment.speaker == speaker:
-                texts.append(segment.text)
-                if len(texts) >= sentences:
-                    break
-        return " ".join(reversed(texts))
+        latest = islice(reversed(self._speaker_history[speaker]), sentences)
+        return " ".join(reversed([segment.text for segment in latest]))
 
     def get_global_context(self, max_chars: int = 500) -> str:
         """Get recent conversation context."""
+        cached = self._global_context_cache.get(max_chars)
+        if cached is not None:
+            return cached
+
         texts = []
         total_chars = 0
 
         for segment in reversed(self.history):
-            prefix = "[ME]" if segment.speaker == Speaker.ME else "[THEM]"
+            prefix = "[ME]" if segment.speaker is Speaker.ME else "[THEM]"
             text = f"{prefix} {segment.text}"
 
             if total_chars + len(text) > max_chars:
@@ -164,27 +249,35 @@ class TextAggregator:
             texts.append(text)
             total_chars += len(text)
 
-        return "\n".join(reversed(texts))
+        context = "\n".join(reversed(texts))
+        self._global_context_cache[max_chars] = context
+        return context
+
+    def seconds_until_timeout(self) -> Optional[float]:
+        """Seconds until the timeout trigger is due, or None if nothing is pending."""
+        if not self._has_pending():
+            return None
+
+        elapsed_ns = time.monotonic_ns() - self.last_delta_time
+        return max(0, AGGREGATION_TIMEOUT_NS - elapsed_ns) / 1e9
 
     def should_trigger_timeout(self) -> bool:
         """Check if we should trigger due to timeout."""
-        if not self.pending_text:
+        if not self._has_pending():
             return False
 
-        elapsed_ms = (time.time() - self.last_delta_time) * 1000
-        return elapsed_ms >= AGGREGATION_TIMEOUT_MS
+        return time.monotonic_ns() - self.last_delta_time >= AGGREGATION_TIMEOUT_NS
 
     def should_trigger_word_count(self) -> bool:
         """Check if we should trigger due to word count."""
-        if not self.pending_text:
+        if not self._has_pending():
             return False
 
-        word_count = len(self.pending_text.split())
-        return word_count >= AGGREGATION_WORD_THRESHOLD
+        return self._pending.words >= AGGREGATION_WORD_THRESHOLD
 
     def get_pending_chunk(self) -> Optional[TextChunk]:
         """Get pending text as a chunk if available."""
-        if not self.pending_text or not self.pending_speaker:
+        if not self._has_pending() or not self.pending_speaker:
             return None
 
         return TextChunk(
@@ -197,10 +290,22 @@ class TextAggregator:
 
     def clear_pending(self) -> None:
         """Clear pending state."""
-        self.pending_text = ""
+        self._pending = None
+        self._pending_text = ""
         self.pending_speaker = None
         self.pending_segment_id = None
 
+    def reset(self) -> None:
+        """Drop all segments, history and pending state, keeping the containers."""
+        self.clear_pending()
+        self.current_segments.clear()
+        self._segment_texts.clear()
+        self.history.clear()
+        for speaker_history in self._speaker_history.values():
+            speaker_history.clear()
+        self._global_context_cache.clear()
+        self.last_delta_time = 0
+
 
 class Orchestrator:
     """Orchestrates transcript aggregation and LLM trigger logic."""
@@ -211,7 +316,8 @@ class Orchestrator:
         self.aggregator = TextAggregator()
 
         self._running = False
-        self._last_hint_time: float = 0
+        self._wakeup = asyncio.Event()
+        self._last_hint_time = -HINT_RATE_LIMIT_NS  # time.monotonic_ns()
 
     async def run(self) -> None:
         """Run the orchestrator."""
@@ -224,9 +330,17 @@ class Orchestrator:
 
             self._running = True
 
-            # Run timeout check loop
+            # Sleep until the pending text's timeout deadline, or until a
+            # new delta moves it; with nothing pending, wait for a delta
             while self._running and self.session.state == SessionState.ACTIVE:
-                await asyncio.sleep(0.1)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=self.aggregator.seconds_until_timeout(),
+                    )
+                except asyncio.TimeoutError:
+                    pass
 
                 # Check for timeout trigger
                 if self.aggregator.should_trigger_timeout():
@@ -242,6 +356,7 @@ class Orchestrator:
     async def _on_delta(self, event: TranscriptDelta) -> None:
         """Handle transcript delta."""
         self.aggregator.add_delta(event)
+        self._wakeup.set()
 
         # Check for word count trigger
         if self.aggregator.should_trigger_word_count():
@@ -290,7 +405,7 @@ class Orchestrator:
     async def _process_interview(self, chunk: TextChunk) -> None:
         """Process chunk in Interview Assistant mode."""
         # Only respond to questions from THEM
-        if chunk.speaker != Speaker.THEM:
+        if chunk.speaker is not Speaker.THEM:
             return
 
         if not chunk.is_question:
@@ -305,16 +420,16 @@ class Orchestrator:
     async def _process_meeting(self, chunk: TextChunk) -> None:
         """Process chunk in Meeting Assistant mode."""
         # Only respond to THEM
-        if chunk.speaker != Speaker.THEM:
+        if chunk.speaker is not Speaker.THEM:
             return
 
         # Rate limiting
-        now = time.time()
-        elapsed_ms = (now - self._last_hint_time) * 1000
+        now = time.monotonic_ns()
+        elapsed_ns = now - self._last_hint_time
 
-        if elapsed_ms < HINT_RATE_LIMIT_MS:
+        if elapsed_ns < HINT_RATE_LIMIT_NS:
             logger.debug("Rate limited",
-                        elapsed_ms=elapsed_ms,
+                        elapsed_ms=elapsed_ns // 1_000_000,
                         limit_ms=HINT_RATE_LIMIT_MS)
             return
 
@@ -68,7 +68,7 @@ class SessionManager:
         logger.info("Session stopped",
                    session_id=session.session_id,
                    stats={
-                       "dropped_frames": session.stats.dropped_frames_count,
+                       "dropped_frames": session.stats.dropped_frames_total,
                        "transcript_segments": session.stats.transcript_segments,
                        "hints_generated": session.stats.hints_generated,
                    })
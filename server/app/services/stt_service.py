@@ -2,19 +2,25 @@
 
 import asyncio
 import base64
-import json
+import itertools
 import time
 import uuid
 from typing import Optional, Callable, Any
 
 import aiohttp
+import numpy as np
+import orjson
 import structlog
 
-from app.config import get_settings, SAMPLE_RATE_STT
-from app.models.session import Session, SessionState
+from app.config import (
+    get_settings,
+    SAMPLE_RATE_STT,
+    STT_BATCH_MAX_FRAMES,
+    STT_WS_HEARTBEAT_S,
+)
+from app.models.session import Session
 from app.models.events import Speaker, TranscriptDelta, TranscriptCompleted
 from app.utils.event_bus import EventBus, EventType
-from app.utils.audio import resample_16k_to_24k
 
 logger = structlog.get_logger()
 
@@ -25,9 +31,14 @@ class RealtimeSTTClient:
     REALTIME_URL = "wss://api.openai.com/v1/realtime"
     MODEL = "gpt-4o-mini-transcribe"
 
+    # input_audio_buffer.append event split around its audio field
+    APPEND_PREFIX = b'{"type":"input_audio_buffer.append","audio":"'
+    APPEND_SUFFIX = b'"}'
+
     def __init__(
         self,
         speaker: Speaker,
+        http_session: aiohttp.ClientSession,
         on_delta: Callable[[str, str], Any],
         on_completed: Callable[[str, str], Any],
     ):
@@ -35,10 +46,14 @@ class RealtimeSTTClient:
         self.on_delta = on_delta
         self.on_completed = on_completed
 
+        # Shared, app-owned session; never closed here
+        self._http_session = http_session
         self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
-        self._session: Optional[aiohttp.ClientSession] = None
         self._connected = False
         self._current_segment_id: Optional[str] = None
+        # Segment IDs: one random prefix per client, then a counter
+        self._segment_prefix = f"{speaker.value}-{uuid.uuid4().hex[:8]}-"
+        self._segment_counter = itertools.count(1)
         self._receive_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> bool:
@@ -46,15 +61,15 @@ class RealtimeSTTClient:
         settings = get_settings()
 
         try:
-            self._session = aiohttp.ClientSession()
-
             headers = {
                 "Authorization": f"Bearer {settings.openai_api_key}",
                 "OpenAI-Beta": "realtime=v1",
             }
 
             url = f"{self.REALTIME_URL}?model={self.MODEL}"
-            self._ws = await self._session.ws_connect(url, headers=headers)
+            self._ws = await self._http_session.ws_connect(
+                url, headers=headers, heartbeat=STT_WS_HEARTBEAT_S
+            )
 
             # Configure session for transcription
             await self._configure_session()
@@ -105,10 +120,6 @@ class RealtimeSTTClient:
             await self._ws.close()
             self._ws = None
 
-        if self._session:
-            await self._session.close()
-            self._session = None
-
         logger.info("STT client disconnected", speaker=self.speaker.value)
 
     async def send_audio(self, pcm_bytes: bytes) -> None:
@@ -116,20 +127,24 @@ class RealtimeSTTClient:
         if not self._connected or not self._ws:
             return
 
-        # Encode to base64
-        audio_b64 = base64.b64encode(pcm_bytes).decode("utf-8")
-
-        message = {
-            "type": "input_audio_buffer.append",
-            "audio": audio_b64,
-        }
-        await self._send(message)
+        # The Realtime API only takes audio as base64 inside a JSON text
+        # event; only the audio field varies, and base64 needs no escaping
+        payload = b"".join((
+            self.APPEND_PREFIX,
+            base64.b64encode(pcm_bytes),
+            self.APPEND_SUFFIX,
+        ))
+        await self._send_text(payload.decode("ascii"))
 
     async def _send(self, data: dict) -> None:
         """Send JSON message to WebSocket."""
+        await self._send_text(orjson.dumps(data).decode())
+
+    async def _send_text(self, text: str) -> None:
+        """Send a serialized JSON event as a text frame."""
         if self._ws and not self._ws.closed:
             try:
-                await self._ws.send_json(data)
+                await self._ws.send_str(text)
             except Exception as e:
                 logger.error("Failed to send to STT", error=str(e))
 
@@ -137,8 +152,8 @@ class RealtimeSTTClient:
         """Receive and process messages from OpenAI."""
         try:
             async for msg in self._ws:
-                if msg.type == aiohttp.WSMsgType.TEXT:
-                    await self._handle_message(json.loads(msg.data))
+                if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    await self._handle_message(orjson.loads(msg.data))
                 elif msg.type == aiohttp.WSMsgType.ERROR:
                     logger.error("STT WebSocket error", error=str(self._ws.exception()))
                     break
@@ -149,6 +164,10 @@ class RealtimeSTTClient:
         except Exception as e:
             logger.error("STT receive error", error=str(e))
 
+    def _next_segment_id(self) -> str:
+        """Allocate a segment ID, unique across both speakers and sessions."""
+        return f"{self._segment_prefix}{next(self._segment_counter)}"
+
     async def _handle_message(self, data: dict) -> None:
         """Handle incoming message from OpenAI."""
         msg_type = data.get("type", "")
@@ -161,7 +180,7 @@ class RealtimeSTTClient:
 
         elif msg_type == "input_audio_buffer.speech_started":
             # New speech segment started
-            self._current_segment_id = str(uuid.uuid4())
+            self._current_segment_id = self._next_segment_id()
             logger.debug("Speech started",
                         speaker=self.speaker.value,
                         segment_id=self._current_segment_id)
@@ -179,7 +198,7 @@ class RealtimeSTTClient:
             # Completed transcription
             transcript = data.get("transcript", "")
             if transcript:
-                segment_id = self._current_segment_id or str(uuid.uuid4())
+                segment_id = self._current_segment_id or self._next_segment_id()
                 await self.on_completed(transcript, segment_id)
                 self._current_segment_id = None
 
@@ -193,13 +212,18 @@ class RealtimeSTTClient:
 class STTService:
     """Service managing STT for both audio channels."""
 
-    def __init__(self, session: Session, event_bus: EventBus):
+    def __init__(
+        self,
+        session: Session,
+        event_bus: EventBus,
+        http_session: aiohttp.ClientSession,
+    ):
         self.session = session
         self.event_bus = event_bus
+        self.http_session = http_session
 
         self._mic_client: Optional[RealtimeSTTClient] = None
         self._system_client: Optional[RealtimeSTTClient] = None
-        self._running = False
 
     async def run(self) -> None:
         """Run the STT service."""
@@ -209,11 +233,13 @@ class STTService:
             # Create STT clients
             self._mic_client = RealtimeSTTClient(
                 speaker=Speaker.ME,
+                http_session=self.http_session,
                 on_delta=self._on_mic_delta,
                 on_completed=self._on_mic_completed,
             )
             self._system_client = RealtimeSTTClient(
                 speaker=Speaker.THEM,
+                http_session=self.http_session,
                 on_delta=self._on_system_delta,
                 on_completed=self._on_system_completed,
             )
@@ -227,24 +253,12 @@ class STTService:
                 await self.event_bus.publish(EventType.STT_ERROR, "Failed to connect to STT")
                 return
 
-            self._running = True
-
-            # Start audio processing tasks
-            mic_task = asyncio.create_task(self._process_mic_audio())
-            system_task = asyncio.create_task(self._process_system_audio())
-
-            # Wait for session to stop
-            while self._running and self.session.state == SessionState.ACTIVE:
-                await asyncio.sleep(0.1)
-
-            # Cancel tasks
-            mic_task.cancel()
-            system_task.cancel()
-
-            try:
-                await asyncio.gather(mic_task, system_task, return_exceptions=True)
-            except asyncio.CancelledError:
-                pass
+            # Process both channels until the session stops. Stopping cancels
+            # this task, and gather passes the cancellation to both consumers.
+            await asyncio.gather(
+                self._process_mic_audio(),
+                self._process_system_audio(),
+            )
 
         except Exception as e:
             logger.error("STT service error", error=str(e))
@@ -253,34 +267,46 @@ class STTService:
             await self._cleanup()
 
     async def _process_mic_audio(self) -> None:
-        """Process audio from mic queue."""
-        while self._running:
+        """Process audio from mic queue until cancelled."""
+        queue = self.session.mic_queue
+        ready = self.session.mic_ready
+        resampler = self.session.mic_resampler
+        while True:
             try:
-                pcm_16k = await asyncio.wait_for(
-                    self.session.mic_queue.get(),
-                    timeout=0.1
-                )
-                pcm_24k = resample_16k_to_24k(pcm_16k)
+                if not queue:
+                    ready.clear()
+                    await ready.wait()
+                    continue
+                # Merge frames that are already waiting into one append
+                frames = [queue.popleft()]
+                while queue and len(frames) < STT_BATCH_MAX_FRAMES:
+                    frames.append(queue.popleft())
+                samples = frames[0] if len(frames) == 1 else np.concatenate(frames)
+                pcm_24k = resampler.process(samples)
                 await self._mic_client.send_audio(pcm_24k)
-            except asyncio.TimeoutError:
-                continue
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error("Mic audio processing error", error=str(e))
 
     async def _process_system_audio(self) -> None:
-        """Process audio from system queue."""
-        while self._running:
+        """Process audio from system queue until cancelled."""
+        queue = self.session.system_queue
+        ready = self.session.system_ready
+        resampler = self.session.system_resampler
+        while True:
             try:
-                pcm_16k = await asyncio.wait_for(
-                    self.session.system_queue.get(),
-                    timeout=0.1
-                )
-                pcm_24k = resample_16k_to_24k(pcm_16k)
+                if not queue:
+                    ready.clear()
+                    await ready.wait()
+                    continue
+                # Merge frames that are already waiting into one append
+                frames = [queue.popleft()]
+                while queue and len(frames) < STT_BATCH_MAX_FRAMES:
+                    frames.append(queue.popleft())
+                samples = frames[0] if len(frames) == 1 else np.concatenate(frames)
+                pcm_24k = resampler.process(samples)
                 await self._system_client.send_audio(pcm_24k)
-            except asyncio.TimeoutError:
-                continue
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -294,6 +320,7 @@ class STTService:
             segment_id=segment_id,
             timestamp=time.time(),
         )
+        self.session.send_event(event)
         await self.event_bus.publish(EventType.TRANSCRIPT_DELTA, event)
 
     async def _on_mic_completed(self, text: str, segment_id: str) -> None:
@@ -305,6 +332,7 @@ class STTService:
             segment_id=segment_id,
             timestamp=time.time(),
         )
+        self.session.send_event(event)
         await self.event_bus.publish(EventType.TRANSCRIPT_COMPLETED, event)
 
     async def _on_system_delta(self, text: str, segment_id: str) -> None:
@@ -315,6 +343,7 @@ class STTService:
             segment_id=segment_id,
             timestamp=time.time(),
         )
+        self.session.send_event(event)
         await self.event_bus.publish(EventType.TRANSCRIPT_DELTA, event)
 
     async def _on_system_completed(self, text: str, segment_id: str) -> None:
@@ -326,12 +355,11 @@ class STTService:
             segment_id=segment_id,
             timestamp=time.time(),
         )
+        self.session.send_event(event)
         await self.event_bus.publish(EventType.TRANSCRIPT_COMPLETED, event)
 
     async def _cleanup(self) -> None:
         """Cleanup STT clients."""
-        self._running = False
-
         if self._mic_client:
             await self._mic_client.disconnect()
         if self._system_client:
@@ -1,11 +1,17 @@
 """Utility modules."""
 
 from app.utils.event_bus import EventBus, EventType
-from app.utils.audio import resample_16k_to_24k, normalize_audio, calculate_level
+from app.utils.audio import (
+    StreamingResampler,
+    resample_16k_to_24k,
+    normalize_audio,
+    calculate_level,
+)
 
 __all__ = [
     "EventBus",
     "EventType",
+    "StreamingResampler",
     "resample_16k_to_24k",
     "normalize_audio",
     "calculate_level",
@@ -1,15 +1,162 @@
 """Audio processing utilities."""
 
+import math
+
 import numpy as np
 from scipy import signal
 
-from app.config import SAMPLE_RATE_CLIENT, SAMPLE_RATE_STT
+from app.config import FRAME_SAMPLES_CLIENT, SAMPLE_RATE_CLIENT, SAMPLE_RATE_STT
+
+
+# Polyphase resampling factors for 16kHz -> 24kHz (ratio 3/2)
+_RESAMPLE_GCD = math.gcd(SAMPLE_RATE_STT, SAMPLE_RATE_CLIENT)
+RESAMPLE_UP = SAMPLE_RATE_STT // _RESAMPLE_GCD      # 3
+RESAMPLE_DOWN = SAMPLE_RATE_CLIENT // _RESAMPLE_GCD  # 2
+
+# Frames whose peak stays below this are treated as silence (about -60dB)
+SILENCE_PEAK_THRESHOLD = 32
+
+
+def _design_resample_kernel() -> tuple[np.ndarray, int]:
+    """
+    Design the anti-aliasing FIR used for resampling.
+
+    Same design as scipy's resample_poly default (Kaiser window, beta=5,
+    10 zero crossings per side), scaled by the upsampling factor and
+    front-padded so the polyphase output lines up with the input.
+
+    Returns:
+        (kernel, number of leading output samples to drop)
+    """
+    max_rate = max(RESAMPLE_UP, RESAMPLE_DOWN)
+    half_len = 10 * max_rate
+    kernel = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    kernel *= RESAMPLE_UP
+
+    pre_pad = RESAMPLE_DOWN - half_len % RESAMPLE_DOWN
+    kernel = np.concatenate([np.zeros(pre_pad), kernel]).astype(np.float32)
+    return kernel, (half_len + pre_pad) // RESAMPLE_DOWN
+
+
+RESAMPLE_KERNEL, _RESAMPLE_DELAY = _design_resample_kernel()
+
+
+def _design_polyphase_taps(kernel: np.ndarray) -> np.ndarray:
+    """
+    Split the resampling kernel into one sub-filter per upsampling phase.
+
+    Row p holds taps p, p + UP, p + 2*UP, ... reversed, so that a window of
+    the most recent input samples dotted with row p yields the output for
+    that phase.
+
+    Returns:
+        (RESAMPLE_UP, taps per phase) float32 array
+    """
+    kernel = np.trim_zeros(kernel, "f")
+    taps = -(-len(kernel) // RESAMPLE_UP)
+    padded = np.zeros(taps * RESAMPLE_UP, dtype=np.float32)
+    padded[:len(kernel)] = kernel
+    return np.ascontiguousarray(padded.reshape(taps, RESAMPLE_UP).T[:, ::-1])
+
+
+_POLY_TAPS = _design_polyphase_taps(RESAMPLE_KERNEL)
+
+
+class StreamingResampler:
+    """
+    Stateful 16kHz -> 24kHz resampler for one continuous audio stream.
+
+    Keeps the tail of the previous frame as filter history, so consecutive
+    20ms frames are filtered as one signal rather than each being
+    zero-padded at its edges. The output is delayed by the filter's group
+    delay (about 0.6ms).
+
+    Scratch buffers are allocated once (and grown for larger chunks), so
+    steady-state frames only allocate the returned bytes.
+    """
+
+    def __init__(self):
+        self._history_len = _POLY_TAPS.shape[1] - 1
+        self._samples_in = 0
+        self._samples_out = 0
+
+        # [history | new samples] as float32, filter output per input
+        # sample and phase, and the int16 output frame
+        self._buffer = np.zeros(self._history_len, dtype=np.float32)
+        self._filtered = np.empty((0, RESAMPLE_UP), dtype=np.float32)
+        self._out = np.empty(0, dtype=np.int16)
+        self._reserve(FRAME_SAMPLES_CLIENT)
+
+    def _reserve(self, n: int) -> None:
+        """Grow the scratch buffers to fit `n` input samples, keeping history."""
+        if n <= len(self._filtered):
+            return
+        buffer = np.zeros(self._history_len + n, dtype=np.float32)
+        buffer[:self._history_len] = self._buffer[:self._history_len]
+        self._buffer = buffer
+        self._filtered = np.empty((n, RESAMPLE_UP), dtype=np.float32)
+        self._out = np.empty(-(-n * RESAMPLE_UP // RESAMPLE_DOWN), dtype=np.int16)
+
+    def process(self, samples: np.ndarray) -> bytes:
+        """
+        Resample the next chunk of the stream.
+
+        Args:
+            samples: int16 mono samples at 16kHz (any array view; it is
+                cast straight into the filter buffer)
+
+        Returns:
+            PCM s16le mono audio at 24kHz (ceil(total_in * 3 / 2) samples
+            emitted so far)
+        """
+        n = len(samples)
+        if n == 0:
+            return b""
+        self._reserve(n)
+
+        # History followed by the new samples, viewed as one window of
+        # taps per input sample (overlapping strides, no copy)
+        history_len = self._history_len
+        buffer = self._buffer
+        buffer[history_len:history_len + n] = samples
+        windows = np.ndarray(
+            (n, history_len + 1), dtype=np.float32, buffer=buffer,
+            strides=(buffer.itemsize, buffer.itemsize),
+        )
+
+        # Filter every window with every phase. Flattened, the result is
+        # indexed by upsampled position, so the outputs (every DOWN-th
+        # position) are a strided slice.
+        filtered = self._filtered[:n]
+        np.matmul(windows, _POLY_TAPS.T, out=filtered)
+
+        samples_in = self._samples_in + n
+        samples_out = -(-samples_in * RESAMPLE_UP // RESAMPLE_DOWN)
+        first = self._samples_out * RESAMPLE_DOWN - self._samples_in * RESAMPLE_UP
+        count = samples_out - self._samples_out
+        samples_24k = filtered.reshape(-1)[first:first + count * RESAMPLE_DOWN:RESAMPLE_DOWN]
+
+        # Round and clip in place, then cast into the output frame
+        np.rint(samples_24k, out=samples_24k)
+        np.clip(samples_24k, -32768, 32767, out=samples_24k)
+        out = self._out[:count]
+        out[:] = samples_24k
+
+        # Carry the newest samples forward as history
+        buffer[:history_len] = buffer[n:n + history_len]
+        self._samples_in = samples_in
+        self._samples_out = samples_out
+
+        return out.tobytes()
 
 
 def resample_16k_to_24k(pcm_bytes: bytes) -> bytes:
     """
     Resample PCM audio from 16kHz to 24kHz.
 
+    Runs a precomputed polyphase FIR (upsample by 3, low-pass, downsample
+    by 2) instead of an FFT round trip on every frame.
+
     Args:
         pcm_bytes: PCM s16le mono audio at 16kHz
 
@@ -19,21 +166,27 @@ def resample_16k_to_24k(pcm_bytes: bytes) -> bytes:
     # Convert bytes to numpy array
     samples_16k = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32)
 
-    # Calculate resampling ratio
-    ratio = SAMPLE_RATE_STT / SAMPLE_RATE_CLIENT  # 24000 / 16000 = 1.5
-
-    # Calculate output length
-    output_length = int(len(samples_16k) * ratio)
+    # Output length: ceil(n * 3 / 2)
+    output_length = -(-len(samples_16k) * RESAMPLE_UP // RESAMPLE_DOWN)
 
-    # Resample using scipy
-    samples_24k = signal.resample(samples_16k, output_length)
+    # Filter and trim the kernel's group delay
+    samples_24k = signal.upfirdn(RESAMPLE_KERNEL, samples_16k, RESAMPLE_UP, RESAMPLE_DOWN)
+    samples_24k = samples_24k[_RESAMPLE_DELAY:_RESAMPLE_DELAY + output_length]
 
-    # Clip and convert back to int16
-    samples_24k = np.clip(samples_24k, -32768, 32767).astype(np.int16)
+    # Round, clip and convert back to int16
+    samples_24k = np.clip(np.rint(samples_24k), -32768, 32767).astype(np.int16)
 
     return samples_24k.tobytes()
 
 
+def _is_silent(pcm: np.ndarray) -> bool:
+    """Check an int16 frame's peak against the silence threshold without a float cast."""
+    # max/min rather than abs: abs(-32768) overflows int16
+    return pcm.size == 0 or (
+        pcm.max() < SILENCE_PEAK_THRESHOLD and pcm.min() > -SILENCE_PEAK_THRESHOLD
+    )
+
+
 def normalize_audio(pcm_bytes: bytes, target_db: float = -20.0) -> bytes:
     """
     Normalize audio to target dB level.
@@ -45,13 +198,15 @@ def normalize_audio(pcm_bytes: bytes, target_db: float = -20.0) -> bytes:
     Returns:
         Normalized PCM audio
     """
-    samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32)
-
-    # Calculate current RMS
-    rms = np.sqrt(np.mean(samples ** 2))
-    if rms < 1e-6:
+    pcm = np.frombuffer(pcm_bytes, dtype=np.int16)
+    if _is_silent(pcm):
         return pcm_bytes  # Silence, no normalization needed
 
+    samples = pcm.astype(np.float32)
+
+    # Calculate current RMS (single BLAS pass)
+    rms = np.sqrt(np.dot(samples, samples) / samples.size)
+
     # Calculate current dB
     current_db = 20 * np.log10(rms / 32768)
 
@@ -59,10 +214,11 @@ def normalize_audio(pcm_bytes: bytes, target_db: float = -20.0) -> bytes:
     gain_db = target_db - current_db
     gain = 10 ** (gain_db / 20)
 
-    # Apply gain with clipping
-    normalized = np.clip(samples * gain, -32768, 32767).astype(np.int16)
+    # Apply gain with clipping, in place
+    np.multiply(samples, gain, out=samples)
+    np.clip(samples, -32768, 32767, out=samples)
 
-    return normalized.tobytes()
+    return samples.astype(np.int16).tobytes()
 
 
 def calculate_level(pcm_bytes: bytes) -> float:
@@ -78,12 +234,14 @@ def calculate_level(pcm_bytes: bytes) -> float:
     if len(pcm_bytes) == 0:
         return -60.0
 
-    samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32)
+    pcm = np.frombuffer(pcm_bytes, dtype=np.int16)
+    if _is_silent(pcm):
+        return -60.0
+
+    samples = pcm.astype(np.float32)
 
     # Calculate RMS
-    rms = np.sqrt(np.mean(samples ** 2))
-    if rms < 1e-6:
-        return -60.0
+    rms = np.sqrt(np.dot(samples, samples) / samples.size)
 
     # Convert to dB
     db = 20 * np.log10(rms / 32768)
@@ -1,39 +1,41 @@
 """Internal event bus for async communication between components."""
 
 import asyncio
-from enum import Enum
+from enum import IntEnum
 from typing import Any, Callable, Coroutine
-from collections import defaultdict
 import structlog
 
 logger = structlog.get_logger()
 
 
-class EventType(str, Enum):
-    """Event types for internal communication."""
+class EventType(IntEnum):
+    """Event types for internal communication.
+
+    Values are contiguous from 0 so they can index the handler table.
+    """
     # Audio events
-    AUDIO_FRAME_MIC = "audio_frame_mic"
-    AUDIO_FRAME_SYSTEM = "audio_frame_system"
+    AUDIO_FRAME_MIC = 0
+    AUDIO_FRAME_SYSTEM = 1
 
     # Transcript events
-    TRANSCRIPT_DELTA = "transcript_delta"
-    TRANSCRIPT_COMPLETED = "transcript_completed"
+    TRANSCRIPT_DELTA = 2
+    TRANSCRIPT_COMPLETED = 3
 
     # Orchestrator events
-    TEXT_CHUNK_READY = "text_chunk_ready"
+    TEXT_CHUNK_READY = 4
 
     # Hint events
-    HINT_TOKEN = "hint_token"
-    HINT_COMPLETED = "hint_completed"
+    HINT_TOKEN = 5
+    HINT_COMPLETED = 6
 
     # Session events
-    SESSION_STARTED = "session_started"
-    SESSION_STOPPED = "session_stopped"
-    SESSION_STATUS = "session_status"
+    SESSION_STARTED = 7
+    SESSION_STOPPED = 8
+    SESSION_STATUS = 9
 
     # Error events
-    STT_ERROR = "stt_error"
-    LLM_ERROR = "llm_error"
+    STT_ERROR = 10
+    LLM_ERROR = 11
 
 
 # Type alias for event handlers
@@ -44,39 +46,42 @@ class EventBus:
     """Async event bus for internal component communication."""
 
     def __init__(self):
-        self._handlers: dict[EventType, list[EventHandler]] = defaultdict(list)
-        self._lock = asyncio.Lock()
+        # Handler tuples indexed by EventType value. Tuples are replaced,
+        # never mutated, so publish can read them without locking; no await
+        # happens between reading and replacing an entry.
+        self._handlers: list[tuple[EventHandler, ...]] = [() for _ in EventType]
 
     async def subscribe(self, event_type: EventType, handler: EventHandler) -> None:
         """Subscribe to an event type."""
-        async with self._lock:
-            if handler not in self._handlers[event_type]:
-                self._handlers[event_type].append(handler)
-                logger.debug("Handler subscribed", event_type=event_type.value)
+        handlers = self._handlers[event_type]
+        if handler not in handlers:
+            self._handlers[event_type] = handlers + (handler,)
+            logger.debug("Handler subscribed", event_type=event_type.name)
 
     async def unsubscribe(self, event_type: EventType, handler: EventHandler) -> None:
         """Unsubscribe from an event type."""
-        async with self._lock:
-            if handler in self._handlers[event_type]:
-                self._handlers[event_type].remove(handler)
-                logger.debug("Handler unsubscribed", event_type=event_type.value)
+        handlers = self._handlers[event_type]
+        if handler in handlers:
+            self._handlers[event_type] = tuple(h for h in handlers if h != handler)
+            logger.debug("Handler unsubscribed", event_type=event_type.name)
 
     async def publish(self, event_type: EventType, payload: Any = None) -> None:
         """Publish an event to all subscribers."""
-        async with self._lock:
-            handlers = list(self._handlers[event_type])
+        handlers = self._handlers[event_type]
 
         if not handlers:
             return
 
-        # Execute all handlers concurrently
-        tasks = [
-            asyncio.create_task(self._safe_call(handler, payload))
-            for handler in handlers
-        ]
+        # Most events have a single subscriber; await it inline
+        if len(handlers) == 1:
+            await self._safe_call(handlers[0], payload)
+            return
 
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        # Run multiple handlers concurrently (gather wraps the coroutines itself)
+        await asyncio.gather(
+            *[self._safe_call(handler, payload) for handler in handlers],
+            return_exceptions=True,
+        )
 
     async def _safe_call(self, handler: EventHandler, payload: Any) -> None:
         """Safely call a handler, catching exceptions."""
@@ -89,4 +94,4 @@ class EventBus:
 
     def clear(self) -> None:
         """Clear all handlers."""
-        self._handlers.clear()
+        self._handlers = [() for _ in EventType]
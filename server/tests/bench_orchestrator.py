@@ -0,0 +1,50 @@
+"""Micro-benchmarks for the orchestrator hot paths.
+
+Not collected by default; run with:
+    pytest tests/bench_orchestrator.py --benchmark-only
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.services.orchestrator import is_question, TextAggregator
+from app.models.events import Speaker, TranscriptDelta
+
+
+CORPUS = (
+    "What is your experience?",
+    "What do you think about this",
+    "How would you approach this problem",
+    "Tell me about your experience",
+    "Could you walk me through the process",
+    "Give me an example of a hard bug",
+    "I understand.",
+    "That sounds great.",
+    "We use Python for this.",
+    "Whatever works for the team.",
+)
+
+DELTA_COUNT = 10_000
+
+
+def test_is_question_bench(benchmark):
+    """Benchmark question detection over a fixed corpus, bypassing the memo."""
+    detect = is_question.__wrapped__
+    benchmark(lambda: [detect(text) for text in CORPUS])
+
+
+def test_add_delta_bench(benchmark):
+    """Benchmark a synthetic stream of deltas into one pending segment."""
+    deltas = [
+        TranscriptDelta(speaker=Speaker.THEM, text="word ", segment_id="seg1", timestamp=float(i))
+        for i in range(DELTA_COUNT)
+    ]
+    aggregator = TextAggregator()
+
+    def run():
+        aggregator.reset()
+        for delta in deltas:
+            aggregator.add_delta(delta)
+
+    benchmark(run)
@@ -1,8 +1,11 @@
 """Tests for audio processing utilities."""
 
+from functools import lru_cache
+
 import numpy as np
 import pytest
 from app.utils.audio import (
+    StreamingResampler,
     resample_16k_to_24k,
     normalize_audio,
     calculate_level,
@@ -11,8 +14,9 @@ from app.utils.audio import (
 )
 
 
+@lru_cache(maxsize=16)
 def generate_sine_wave(freq: float, duration: float, sample_rate: int) -> bytes:
-    """Generate a sine wave as PCM s16le bytes."""
+    """Generate a sine wave as PCM s16le bytes (cached; bytes are immutable)."""
     t = np.linspace(0, duration, int(sample_rate * duration), False)
     samples = np.sin(2 * np.pi * freq * t) * 0.5  # 50% amplitude
     return float32_to_pcm(samples.astype(np.float32))
@@ -46,6 +50,18 @@ class TestResample:
         assert len(samples) > 0
         assert np.max(np.abs(samples)) > 0  # Not silence
 
+    def test_streaming_resampler_frames_match_single_call(self):
+        """Test that frame-by-frame output is the same as one call over the whole stream."""
+        samples = np.frombuffer(generate_sine_wave(440, 0.1, 16000), dtype=np.int16)
+
+        frames = StreamingResampler()
+        pcm_24k = b"".join(
+            frames.process(samples[i:i + 320]) for i in range(0, len(samples), 320)
+        )
+
+        assert pcm_24k == StreamingResampler().process(samples)
+        assert len(pcm_24k) // 2 == 2400
+
 
 class TestNormalize:
     """Tests for audio normalization."""
@@ -68,6 +84,11 @@ class TestNormalize:
         result = normalize_audio(silence)
         assert result == silence
 
+    def test_normalize_noise_floor_unchanged(self):
+        """Test that a frame below the silence threshold is not amplified."""
+        noise = np.array([0, 12, -31, 7, -20] * 64, dtype=np.int16).tobytes()
+        assert normalize_audio(noise) == noise
+
 
 class TestCalculateLevel:
     """Tests for level calculation."""
@@ -0,0 +1,169 @@
+"""Tests for the knowledge service."""
+
+import json
+import mmap
+
+import numpy as np
+import pytest
+from app.services import knowledge_service
+from app.services.knowledge_service import (
+    INDEX_DIR_NAME,
+    INDEX_FORMAT,
+    KnowledgeService,
+    chunk_spans,
+)
+
+
+WORKSPACE = "interview"
+
+FILES = {
+    "k8s.md": "# Kubernetes\n\nKubernetes runs containers. Kubernetes schedules pods on kubernetes nodes.",
+    "infra.md": "# Infrastructure\n\nTerraform provisions networks, databases and one kubernetes cluster for staging.",
+    "python.md": "# Python\n\nPython services use asyncio and FastAPI for request handling.",
+}
+
+
+@pytest.fixture
+def workspaces(tmp_path, monkeypatch):
+    """Point the service at a temporary workspaces directory."""
+    monkeypatch.setattr(knowledge_service, "WORKSPACES_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def workspace(workspaces):
+    """A workspace holding FILES."""
+    path = workspaces / WORKSPACE
+    path.mkdir()
+    for filename, content in FILES.items():
+        (path / filename).write_text(content, encoding="utf-8")
+    return path
+
+
+def ranked_files(index, query):
+    """Filenames of the chunks matching a query, best first."""
+    terms = knowledge_service.extract_keywords(query, top_n=10)
+    return [index.chunk(chunk_id)[0] for chunk_id, _ in index.search(terms, top_k=10)]
+
+
+class TestChunking:
+    """Tests for splitting documents into overlapping chunks."""
+
+    def test_breaks_at_preferred_sentence_end(self):
+        """Test that the first boundary type found in the second half of the window wins."""
+        text = "a" * 600 + ". " + "b" * 300 + "! " + "c" * 300
+
+        assert chunk_spans(text, max_chars=1000, overlap=100) == [(0, 601), (501, 1204)]
+
+    def test_paragraph_break_when_no_sentence_end(self):
+        """Test that a blank line is used when the window has no sentence end."""
+        text = "a" * 700 + "\n\n\n" + "b" * 700
+
+        assert chunk_spans(text, max_chars=1000, overlap=100)[0] == (0, 702)
+
+
+class TestRetrieval:
+    """Tests for BM25 ranking and retrieval."""
+
+    def test_bm25_ranking_order(self, workspace):
+        """Test that chunks with more occurrences of a query term rank higher."""
+        index = KnowledgeService()._get_index(WORKSPACE)
+
+        assert ranked_files(index, "kubernetes") == ["k8s.md", "infra.md"]
+        assert ranked_files(index, "asyncio") == ["python.md"]
+        assert ranked_files(index, "haskell") == []
+
+    def test_retrieve_context(self, workspace):
+        """Test that retrieved context names the source file."""
+        context = KnowledgeService().retrieve(WORKSPACE, "terraform", top_k=1)
+
+        assert context == f"[From infra.md]\n{FILES['infra.md']}"
+
+    def test_empty_workspace(self, workspaces):
+        """Test that a workspace without files returns no context."""
+        (workspaces / WORKSPACE).mkdir()
+        service = KnowledgeService()
+
+        assert service.retrieve(WORKSPACE, "kubernetes") == ""
+        assert len(service._get_index(WORKSPACE)) == 0
+
+        # The empty index round-trips through disk as well
+        assert len(KnowledgeService()._get_index(WORKSPACE)) == 0
+
+    def test_empty_file(self, workspace):
+        """Test that an empty file is indexed without affecting other files."""
+        (workspace / "empty.md").write_bytes(b"")
+        index = KnowledgeService()._get_index(WORKSPACE)
+
+        assert "empty.md" in [f["filename"] for f in index.files]
+        assert ranked_files(index, "kubernetes") == ["k8s.md", "infra.md"]
+
+
+    def test_crlf_file_matches_lf(self, workspaces):
+        """Test that a CRLF file is chunked and retrieved the same as its LF version."""
+        paragraph = "Kubernetes schedules pods across nodes and restarts failed containers. " * 6
+        content = "# Kubernetes\n\n" + "\n\n".join([paragraph] * 4)
+
+        contexts = []
+        for workspace, newline in (("lf", "\n"), ("crlf", "\r\n")):
+            path = workspaces / workspace
+            path.mkdir()
+            (path / "k8s.md").write_bytes(content.replace("\n", newline).encode("utf-8"))
+
+            service = KnowledgeService()
+            index = service._get_index(workspace)
+            contexts.append((
+                index.files[0]["title"],
+                [index.chunk(chunk_id)[1] for chunk_id in range(len(index))],
+                service.retrieve(workspace, "kubernetes pods", top_k=5),
+            ))
+
+        lf, crlf = contexts
+        assert len(lf[1]) > 1
+        assert crlf == lf
+        assert all("\r" not in text for text in crlf[1])
+
+
+class TestPersistence:
+    """Tests for saving, loading and invalidating workspace indexes."""
+
+    def test_save_load_round_trip(self, workspace):
+        """Test that a memory-mapped index retrieves the same context as the built one."""
+        built = KnowledgeService()
+        expected = [built.retrieve(WORKSPACE, query) for query in ("kubernetes", "python asyncio")]
+
+        loaded = KnowledgeService()
+        index = loaded._get_index(WORKSPACE)
+
+        # Arrays are read-only views of the mapped files, not copies
+        assert isinstance(index.idf, np.memmap)
+        assert not index.weights.data.flags.writeable
+        assert isinstance(index.chunk_texts.blob, mmap.mmap)
+        assert [loaded.retrieve(WORKSPACE, query) for query in ("kubernetes", "python asyncio")] == expected
+
+    def test_format_mismatch_rebuilds(self, workspace):
+        """Test that an index written in another format is rebuilt."""
+        KnowledgeService()._get_index(WORKSPACE)
+
+        meta_path = workspace / INDEX_DIR_NAME / "meta.json"
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        meta["format"] = INDEX_FORMAT - 1
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+        index = KnowledgeService()._get_index(WORKSPACE)
+
+        assert ranked_files(index, "kubernetes") == ["k8s.md", "infra.md"]
+        assert json.loads(meta_path.read_text(encoding="utf-8"))["format"] == INDEX_FORMAT
+
+    def test_invalidate_reindexes(self, workspace):
+        """Test that invalidate() picks up files added after the index was built."""
+        service = KnowledgeService()
+        assert service.retrieve(WORKSPACE, "haskell") == ""
+
+        (workspace / "haskell.md").write_text("# Haskell\n\nHaskell has lazy evaluation.", encoding="utf-8")
+        assert service.retrieve(WORKSPACE, "haskell") == ""
+
+        service.invalidate(WORKSPACE)
+
+        assert service.retrieve(WORKSPACE, "haskell").startswith("[From haskell.md]")
+        assert "haskell.md" in [f["filename"] for f in KnowledgeService()._get_index(WORKSPACE).files]
@@ -1,52 +1,80 @@
 """Tests for the orchestrator module."""
 
 import pytest
-from app.services.orchestrator import is_question, TextAggregator
+from app.services.orchestrator import (
+    is_question,
+    is_question_batch,
+    TextAggregator,
+    TranscriptSegment,
+)
 from app.models.events import Speaker, TranscriptDelta, TranscriptCompleted
 
 
+# Question detection truth table, grouped by what triggers detection
+QUESTION_MARK_CASES = (
+    "What is your experience?",
+    "Can you tell me more?",
+    "Really?",
+)
+QUESTION_WORD_CASES = (
+    "What do you think about this",
+    "How would you approach this problem",
+    "Why did you choose that solution",
+    "When did you start working on this",
+    "Where have you applied this before",
+    "Who was involved in the project",
+    "Which technology did you use",
+)
+INVITATION_CASES = (
+    "Tell me about your experience",
+    "Can you explain how you did that",
+    "Could you walk me through the process",
+    "Describe your approach",
+    "Give me an example of that",
+)
+NON_QUESTION_CASES = (
+    "I understand.",
+    "That sounds great.",
+    "We use Python for this.",
+    "The system handles 1000 requests per second.",
+)
+
+
 class TestQuestionDetection:
     """Tests for question detection."""
 
-    def test_question_mark(self):
-        """Test detection of question mark."""
-        assert is_question("What is your experience?")
-        assert is_question("Can you tell me more?")
-        assert is_question("Really?")
-
-    def test_question_words(self):
-        """Test detection of question words at start."""
-        assert is_question("What do you think about this")
-        assert is_question("How would you approach this problem")
-        assert is_question("Why did you choose that solution")
-        assert is_question("When did you start working on this")
-        assert is_question("Where have you applied this before")
-        assert is_question("Who was involved in the project")
-        assert is_question("Which technology did you use")
-
-    def test_invitation_phrases(self):
-        """Test detection of invitation phrases."""
-        assert is_question("Tell me about your experience")
-        assert is_question("Can you explain how you did that")
-        assert is_question("Could you walk me through the process")
-        assert is_question("Describe your approach")
-        assert is_question("Give me an example of that")
-
-    def test_non_questions(self):
-        """Test that statements are not detected as questions."""
-        assert not is_question("I understand.")
-        assert not is_question("That sounds great.")
-        assert not is_question("We use Python for this.")
-        assert not is_question("The system handles 1000 requests per second.")
+    @pytest.mark.parametrize(
+        "text,expected",
+        [(text, True) for text in QUESTION_MARK_CASES + QUESTION_WORD_CASES + INVITATION_CASES]
+        + [(text, False) for text in NON_QUESTION_CASES],
+    )
+    def test_is_question(self, text, expected):
+        """Test questions, question words and invitations against statements."""
+        assert is_question(text) is expected
+
+    def test_is_question_batch(self):
+        """Test the batch API classifies every case in one call."""
+        questions = QUESTION_MARK_CASES + QUESTION_WORD_CASES + INVITATION_CASES
+        texts = list(questions + NON_QUESTION_CASES)
+
+        assert is_question_batch(texts) == [True] * len(questions) + [False] * len(NON_QUESTION_CASES)
+
+
+@pytest.fixture(scope="module")
+def aggregator():
+    """One aggregator shared by the module; reset before each test."""
+    return TextAggregator()
 
 
 class TestTextAggregator:
     """Tests for text aggregation."""
 
-    def test_add_delta(self):
-        """Test adding transcript deltas."""
-        aggregator = TextAggregator()
+    @pytest.fixture(autouse=True)
+    def _reset(self, aggregator):
+        aggregator.reset()
 
+    def test_add_delta(self, aggregator):
+        """Test adding transcript deltas."""
         delta1 = TranscriptDelta(
             speaker=Speaker.THEM,
             text="Hello, ",
@@ -68,10 +96,8 @@ class TestTextAggregator:
 
         assert aggregator.pending_text == "Hello, how are you?"
 
-    def test_complete_segment(self):
+    def test_complete_segment(self, aggregator):
         """Test completing a segment."""
-        aggregator = TextAggregator()
-
         # Add delta first
         delta = TranscriptDelta(
             speaker=Speaker.THEM,
@@ -90,15 +116,17 @@ class TestTextAggregator:
         )
         segment = aggregator.complete_segment(completed)
 
-        assert segment is not None
-        assert segment.text == "Hello, how are you?"
-        assert segment.is_complete
+        assert segment == TranscriptSegment(
+            speaker=Speaker.THEM,
+            text="Hello, how are you?",
+            segment_id="seg1",
+            timestamp=1.0,
+            is_complete=True,
+        )
         assert len(aggregator.history) == 1
 
-    def test_get_last_context(self):
+    def test_get_last_context(self, aggregator):
         """Test getting last context for speaker."""
-        aggregator = TextAggregator()
-
         # Add completed segments
         for i, text in enumerate(["First message", "Second message", "Third message"]):
             completed = TranscriptCompleted(
@@ -113,10 +141,8 @@ class TestTextAggregator:
         assert "Second message" in context
         assert "Third message" in context
 
-    def test_word_count_trigger(self):
+    def test_word_count_trigger(self, aggregator):
         """Test word count trigger."""
-        aggregator = TextAggregator()
-
         # Add delta with many words
         delta = TranscriptDelta(
             speaker=Speaker.THEM,
@@ -128,10 +154,8 @@ class TestTextAggregator:
 
         assert aggregator.should_trigger_word_count()
 
-    def test_word_count_no_trigger(self):
+    def test_word_count_no_trigger(self, aggregator):
         """Test that short text doesn't trigger."""
-        aggregator = TextAggregator()
-
         delta = TranscriptDelta(
             speaker=Speaker.THEM,
             text="Hello world",
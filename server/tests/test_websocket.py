@@ -0,0 +1,262 @@
+"""Tests for the WebSocket route."""
+
+import asyncio
+import struct
+
+import pytest
+from structlog.testing import capture_logs
+from app.routes import websocket as websocket_route
+from app.routes.websocket import ConnectionHandler, encode_hint_token, encode_transcript_delta
+from app.models.events import Speaker, HintToken, HintCompleted, TranscriptDelta
+from app.config import OUT_QUEUE_MAX_SIZE, OUT_QUEUE_STREAM_LIMIT
+from app.models.session import Session
+from app.services.session_manager import SessionManager
+
+
+class RecordingWebSocket:
+    """Collects the frames a handler sends, in order."""
+
+    def __init__(self):
+        self.frames = []
+        self.closed = False
+        self._sent = asyncio.Event()
+
+    async def send_text(self, payload: str) -> None:
+        self.frames.append(payload)
+        self._sent.set()
+
+    async def send_bytes(self, payload: bytes) -> None:
+        self.frames.append(payload)
+        self._sent.set()
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def wait_for_frame(self, payload) -> None:
+        """Wait until payload is the last frame sent."""
+        while not self.frames or self.frames[-1] != payload:
+            self._sent.clear()
+            await self._sent.wait()
+
+
+class BrokenWebSocket(RecordingWebSocket):
+    """Fails every send, like a socket the client has dropped."""
+
+    async def send_text(self, payload: str) -> None:
+        raise RuntimeError("Cannot send once the connection is closed")
+
+    send_bytes = send_text
+
+
+class Unencodable:
+    """An outbound event whose serialization fails."""
+
+    def model_dump_json(self) -> str:
+        raise ValueError("not serializable")
+
+
+# Queued after the events under test; once it is sent, everything before it has been
+DRAINED = '{"type":"drained"}'
+
+
+@pytest.fixture(autouse=True)
+def _no_coalesce_window(monkeypatch):
+    """Merge only tokens already queued, so writer tests never wait on the clock."""
+    monkeypatch.setattr(websocket_route, "HINT_TOKEN_COALESCE_MS", 0)
+
+
+def drain(events: list) -> list:
+    """Run the connection writer over queued events and return the sent frames."""
+
+    async def run():
+        websocket = RecordingWebSocket()
+        handler = ConnectionHandler(websocket, SessionManager())
+        handler.session = Session()
+        for event in [*events, DRAINED]:
+            handler.session.out_queue.put_nowait(event)
+
+        handler._writer_task = asyncio.create_task(handler._writer())
+        await asyncio.wait_for(websocket.wait_for_frame(DRAINED), timeout=1)
+        await handler._stop_writer()
+        return websocket.frames[:-1]
+
+    return asyncio.run(run())
+
+
+class TestFrameEncoding:
+    """Tests for the binary server -> client frames decoded by client/src/lib/frames.ts."""
+
+    def test_hint_token_layout(self):
+        """Test tag, hint_id length, hint_id and token bytes."""
+        frame = encode_hint_token(HintToken(hint_id="h1", token="Mention caching"))
+
+        assert frame == b"\x01\x02h1Mention caching"
+
+    def test_hint_token_multibyte_utf8(self):
+        """Test that lengths count UTF-8 bytes, not characters."""
+        frame = encode_hint_token(HintToken(hint_id="ид", token="Café ✓"))
+
+        assert frame == b"\x01\x04" + "ид".encode() + "Café ✓".encode()
+
+    def test_transcript_delta_layout(self):
+        """Test tag, speaker, f64 LE timestamp, segment_id length, segment_id and text bytes."""
+        frame = encode_transcript_delta(TranscriptDelta(
+            speaker=Speaker.THEM,
+            text="Héllo, wörld",
+            segment_id="seg1",
+            timestamp=1.5,
+        ))
+
+        assert frame == (
+            b"\x02\x01" + struct.pack("<d", 1.5) + b"\x04seg1" + "Héllo, wörld".encode()
+        )
+
+    def test_transcript_delta_speaker_bytes(self):
+        """Test that speakers map to the audio channel IDs (0=mic, 1=system)."""
+        frame = encode_transcript_delta(TranscriptDelta(
+            speaker=Speaker.ME, text="", segment_id="", timestamp=0.0,
+        ))
+
+        assert frame == b"\x02\x00" + struct.pack("<d", 0.0) + b"\x00"
+
+    def test_length_prefix_limit(self):
+        """Test that IDs up to 255 bytes fit the u8 length prefix."""
+        frame = encode_hint_token(HintToken(hint_id="h" * 255, token="x"))
+        assert frame == b"\x01\xff" + b"h" * 255 + b"x"
+
+        frame = encode_transcript_delta(TranscriptDelta(
+            speaker=Speaker.ME, text="x", segment_id="s" * 255, timestamp=0.0,
+        ))
+        assert frame[10] == 255 and frame[11:] == b"s" * 255 + b"x"
+
+    def test_long_id_falls_back_to_json(self):
+        """Test that IDs over 255 UTF-8 bytes are sent as JSON text frames instead."""
+        token = HintToken(hint_id="h" * 256, token="x")
+        assert encode_hint_token(token) == token.model_dump_json()
+
+        # 128 characters, 256 bytes
+        delta = TranscriptDelta(speaker=Speaker.ME, text="x", segment_id="é" * 128, timestamp=0.0)
+        assert encode_transcript_delta(delta) == delta.model_dump_json()
+
+    def test_writer_sends_fallback_as_text(self):
+        """Test that the writer sends a fallback frame as text between binary frames."""
+        long_token = HintToken(hint_id="h" * 256, token="x")
+        delta = TranscriptDelta(speaker=Speaker.ME, text="x", segment_id="seg1", timestamp=0.0)
+
+        frames = drain([long_token, delta])
+
+        assert frames == [long_token.model_dump_json(), encode_transcript_delta(delta)]
+
+
+class TestHintCoalescing:
+    """Tests for merging queued hint tokens into one frame."""
+
+    def test_consecutive_tokens_merge(self):
+        """Test that queued tokens for one hint are sent as a single frame."""
+        frames = drain([HintToken(hint_id="h1", token=token) for token in ("Ask ", "about ", "scale")])
+
+        assert frames == [encode_hint_token(HintToken(hint_id="h1", token="Ask about scale"))]
+
+    def test_hint_completed_not_reordered(self):
+        """Test that a completed hint between tokens keeps its place."""
+        completed = HintCompleted(hint_id="h1", final_text="Ask about", mode="interview_assistant")
+        frames = drain([
+            HintToken(hint_id="h1", token="Ask "),
+            HintToken(hint_id="h1", token="about"),
+            completed,
+            HintToken(hint_id="h2", token="Next"),
+        ])
+
+        assert frames == [
+            encode_hint_token(HintToken(hint_id="h1", token="Ask about")),
+            completed.model_dump_json(),
+            encode_hint_token(HintToken(hint_id="h2", token="Next")),
+        ]
+
+    def test_transcript_delta_not_merged_across(self):
+        """Test that tokens on either side of a transcript delta are not merged over it."""
+        delta = TranscriptDelta(speaker=Speaker.THEM, text="Right", segment_id="seg1", timestamp=1.0)
+        frames = drain([
+            HintToken(hint_id="h1", token="Ask "),
+            delta,
+            HintToken(hint_id="h1", token="about"),
+        ])
+
+        assert frames == [
+            encode_hint_token(HintToken(hint_id="h1", token="Ask ")),
+            encode_transcript_delta(delta),
+            encode_hint_token(HintToken(hint_id="h1", token="about")),
+        ]
+
+
+    def test_lone_token_not_delayed(self, monkeypatch):
+        """Test that a token with nothing queued behind it skips the coalescing window."""
+        monkeypatch.setattr(websocket_route, "HINT_TOKEN_COALESCE_MS", 60_000)
+        token = HintToken(hint_id="h1", token="Ask")
+
+        async def run():
+            handler = ConnectionHandler(RecordingWebSocket(), SessionManager())
+            handler.session = Session()
+            return await asyncio.wait_for(handler._coalesce_hint_tokens(token), timeout=1)
+
+        assert asyncio.run(run()) == (token, None)
+
+
+class TestOutboundBackpressure:
+    """Tests for bounding the outbound queue when the client falls behind."""
+
+    def test_streaming_events_dropped_first(self):
+        """Test that tokens and deltas are dropped past the stream limit while completed events still queue."""
+        session = Session()
+        for _ in range(OUT_QUEUE_STREAM_LIMIT):
+            session.send_event(HintToken(hint_id="h1", token="x"))
+
+        session.send_event(HintToken(hint_id="h1", token="x"))
+        session.send_event(TranscriptDelta(speaker=Speaker.ME, text="x", segment_id="s", timestamp=0.0))
+        session.send_event(HintCompleted(hint_id="h1", final_text="x", mode="interview_assistant"))
+
+        assert session.out_queue.qsize() == OUT_QUEUE_STREAM_LIMIT + 1
+        assert session.stats.dropped_events == 2
+
+    def test_full_queue_drops_without_raising(self):
+        """Test that a full queue counts dropped events instead of growing."""
+        session = Session()
+        for _ in range(OUT_QUEUE_MAX_SIZE + 1):
+            session.send_event(HintCompleted(hint_id="h1", final_text="x", mode="interview_assistant"))
+
+        assert session.out_queue.qsize() == OUT_QUEUE_MAX_SIZE
+        assert session.stats.dropped_events == 1
+
+
+class TestWriterFailures:
+    """Tests for keeping the connection writer alive or shutting it down cleanly."""
+
+    def test_encode_failure_skips_event(self):
+        """Test that an event that fails to encode is skipped and later events still go out."""
+        frames = drain([Unencodable(), '{"type":"status"}'])
+
+        assert frames == ['{"type":"status"}']
+
+    def test_send_failure_closes_socket(self):
+        """Test that a failed send closes the socket and stops the writer with a log entry."""
+
+        async def run():
+            websocket = BrokenWebSocket()
+            handler = ConnectionHandler(websocket, SessionManager())
+            handler.session = Session()
+            handler.session.out_queue.put_nowait('{"type":"status"}')
+
+            handler._writer_task = asyncio.create_task(handler._writer())
+            handler._writer_task.add_done_callback(handler._on_writer_done)
+            await asyncio.wait_for(handler._writer_task, timeout=1)
+            await asyncio.sleep(0)  # Done callbacks run on the next loop iteration
+            return websocket
+
+        with capture_logs() as logs:
+            websocket = asyncio.run(run())
+
+        assert websocket.closed
+        assert [entry["event"] for entry in logs if entry["log_level"] != "debug"] == [
+            "Failed to send message",
+            "Writer task stopped",
+        ]